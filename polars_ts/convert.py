@@ -2,6 +2,7 @@ from typing import Generic, Optional
 import polars as pl
 from polars.type_aliases import IntoExpr
 
+from .grouper import Grouper
 from .sf import SeriesFrame
 from .sf_helper import prepare_result
 from .utils import parse_into_expr
@@ -41,7 +42,7 @@ class ConvertFrame(SeriesFrame, Generic[FrameType]):
 
         if value_unit is None:
             value_unit = f"{value.meta.output_name()}_unit"
-            if value_unit not in self._df.columns:
+            if value_unit not in Grouper.columns(self._df, include_time=True):
                 raise ValueError(f"Missing unit column: '{value_unit}'")
 
         value_unit = parse_into_expr(value_unit).cast(pl.Categorical)
@@ -1,6 +1,7 @@
 from typing import Tuple
 import polars as pl
 
+from ..grouper import Grouper
 from ..types import FrameType
 from ..sf_helper import column_name_unique_over
 
@@ -149,7 +150,7 @@ def _impl_convert_single_dim(
     conversion_join_cols = ["target", "base"] if invert else ["base", "target"]
     working_columns = []
 
-    if target_unit_name not in df.columns:
+    if target_unit_name not in Grouper.columns(df, include_time=True):
         df = df.with_columns(target_unit.alias(target_unit_name))
         working_columns.append(target_unit_name)
 
@@ -1,13 +1,20 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Any, Dict, List, Optional
 
 import polars as pl
 
 if TYPE_CHECKING:
     from polars.type_aliases import IntoExpr
 
+from ..types import (
+    CumulativeOp,
+    DrawdownMethod,
+    IntervalType,
+    PairwiseStatistic,
+    RollingStatistic,
+)
 from ..utils import parse_into_expr
 
 
@@ -60,3 +67,347 @@ def diff_custom(
         args=[values_expr, n, method],
         is_elementwise=False,
     )
+
+
+def _per_partition(param: IntoExpr, partition_id: IntoExpr) -> pl.Expr:
+    # one entry per partition, in the order the partitions appear
+    partition_id = parse_into_expr(partition_id)
+    return parse_into_expr(param).filter(partition_id.is_first_distinct())
+
+
+def _ewm_seed(state: Optional[IntoExpr], partition_id: pl.Expr) -> List[pl.Expr]:
+    # the state to resume each partition from: a struct of weight, mean and count
+    if state is None:
+        return []
+
+    state = parse_into_expr(state)
+    return [
+        _per_partition(state.struct.field("weight"), partition_id).cast(pl.Float64),
+        _per_partition(state.struct.field("mean"), partition_id).cast(pl.Float64),
+        _per_partition(state.struct.field("count"), partition_id).cast(pl.UInt64),
+    ]
+
+
+def ewm_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    alpha: IntoExpr,
+    min_periods: IntoExpr,
+    adjust: IntoExpr,
+    state: Optional[IntoExpr] = None,
+) -> pl.Expr:
+    # values are expected to be sorted by partition
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    alpha = _per_partition(alpha, partition_id).cast(pl.Float64)
+    min_periods = _per_partition(min_periods, partition_id).cast(pl.UInt64)
+    adjust = _per_partition(adjust, partition_id).cast(pl.Boolean)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_ewm_partitioned",
+        args=[
+            values_expr,
+            partition_id,
+            alpha,
+            min_periods,
+            adjust,
+            *_ewm_seed(state, partition_id),
+        ],
+        is_elementwise=False,
+    )
+
+
+def ewm_by_time_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    time: IntoExpr,
+    alpha: IntoExpr,
+    half_life: IntoExpr,
+    min_periods: IntoExpr,
+    adjust: IntoExpr,
+) -> pl.Expr:
+    # values are expected to be sorted by partition, then by time
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    alpha = _per_partition(alpha, partition_id).cast(pl.Float64)
+    half_life = _per_partition(half_life, partition_id).cast(pl.String)
+    min_periods = _per_partition(min_periods, partition_id).cast(pl.UInt64)
+    adjust = _per_partition(adjust, partition_id).cast(pl.Boolean)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_ewm_by_time_partitioned",
+        args=[
+            values_expr,
+            partition_id,
+            parse_into_expr(time),
+            alpha,
+            half_life,
+            min_periods,
+            adjust,
+        ],
+        is_elementwise=False,
+    )
+
+
+def ewm_bank_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    alphas: List[float],
+    min_periods: IntoExpr,
+    adjust: IntoExpr,
+) -> pl.Expr:
+    # values are expected to be sorted by partition. the result holds a list of
+    # one mean per alpha for each row
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    min_periods = _per_partition(min_periods, partition_id).cast(pl.UInt64)
+    adjust = _per_partition(adjust, partition_id).cast(pl.Boolean)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_ewm_bank_partitioned",
+        args=[values_expr, partition_id, min_periods, adjust],
+        kwargs={"alphas": [float(alpha) for alpha in alphas]},
+        is_elementwise=False,
+    )
+
+
+def ewm_state_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    alpha: IntoExpr,
+    adjust: IntoExpr,
+    state: Optional[IntoExpr] = None,
+) -> pl.Expr:
+    # values are expected to be sorted by partition. the result holds one row
+    # per partition: the state after its last value
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    alpha = _per_partition(alpha, partition_id).cast(pl.Float64)
+    adjust = _per_partition(adjust, partition_id).cast(pl.Boolean)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_ewm_state_partitioned",
+        args=[
+            values_expr,
+            partition_id,
+            alpha,
+            adjust,
+            *_ewm_seed(state, partition_id),
+        ],
+        is_elementwise=False,
+        changes_length=True,
+    )
+
+
+def shift_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    n: IntoExpr,
+) -> pl.Expr:
+    # values are expected to be sorted by partition
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    n = _per_partition(n, partition_id).cast(pl.Int64)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_shift_partitioned",
+        args=[values_expr, partition_id, n],
+        is_elementwise=False,
+    )
+
+
+def diff_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    n: IntoExpr,
+    method: IntoExpr,
+) -> pl.Expr:
+    # values are expected to be sorted by partition
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    n = _per_partition(n, partition_id).cast(pl.Int64)
+    method = _per_partition(method, partition_id).cast(pl.String)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_diff_partitioned",
+        args=[values_expr, partition_id, n, method],
+        is_elementwise=False,
+    )
+
+
+def rolling_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    window: IntoExpr,
+    min_periods: IntoExpr,
+    quantile: IntoExpr,
+    period: IntoExpr,
+    statistic: RollingStatistic,
+    closed: IntervalType = "right",
+    time: Optional[IntoExpr] = None,
+) -> pl.Expr:
+    # values are expected to be sorted by partition (then by time, for a period)
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    window = _per_partition(window, partition_id).cast(pl.Int64)
+    min_periods = _per_partition(min_periods, partition_id).cast(pl.Int64)
+    quantile = _per_partition(quantile, partition_id).cast(pl.Float64)
+    period = _per_partition(period, partition_id).cast(pl.String)
+
+    args = [values_expr, partition_id, window, min_periods, quantile, period]
+    if time is not None:
+        args.append(parse_into_expr(time))
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_rolling_partitioned",
+        args=args,
+        kwargs={"statistic": statistic, "closed": closed},
+        is_elementwise=False,
+    )
+
+
+def rolling_pairwise_partitioned(
+    values_expr: IntoExpr,
+    other_expr: IntoExpr,
+    partition_id: IntoExpr,
+    window: IntoExpr,
+    min_periods: IntoExpr,
+    period: IntoExpr,
+    statistic: PairwiseStatistic,
+    closed: IntervalType = "right",
+    time: Optional[IntoExpr] = None,
+) -> pl.Expr:
+    # values and other are aligned row by row, sorted by partition
+    # (then by time, for a period)
+    values_expr = parse_into_expr(values_expr)
+    other_expr = parse_into_expr(other_expr)
+    partition_id = parse_into_expr(partition_id)
+    window = _per_partition(window, partition_id).cast(pl.Int64)
+    min_periods = _per_partition(min_periods, partition_id).cast(pl.Int64)
+    period = _per_partition(period, partition_id).cast(pl.String)
+
+    args = [values_expr, other_expr, partition_id, window, min_periods, period]
+    if time is not None:
+        args.append(parse_into_expr(time))
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_rolling_pairwise_partitioned",
+        args=args,
+        kwargs={"statistic": statistic, "closed": closed},
+        is_elementwise=False,
+    )
+
+
+def ewm_cov_matrix(
+    values_expr: IntoExpr,
+    series_id: IntoExpr,
+    time: IntoExpr,
+    alpha: IntoExpr,
+    min_periods: IntoExpr,
+    adjust: IntoExpr,
+    correlation: bool = False,
+) -> pl.Expr:
+    # values are expected to be sorted by time. the result holds the full
+    # matrix of the series after each distinct time, row-major
+    values_expr = parse_into_expr(values_expr)
+    series_id = parse_into_expr(series_id)
+    time = parse_into_expr(time)
+    alpha = parse_into_expr(alpha).unique().cast(pl.Float64)
+    min_periods = parse_into_expr(min_periods).unique().cast(pl.UInt64)
+    adjust = parse_into_expr(adjust).unique().cast(pl.Boolean)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_ewm_cov_matrix",
+        args=[values_expr, series_id, time, alpha, min_periods, adjust],
+        kwargs={"correlation": correlation},
+        is_elementwise=False,
+        changes_length=True,
+    )
+
+
+def cum_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    reset: IntoExpr,
+    op: CumulativeOp = "sum",
+) -> pl.Expr:
+    # values are expected to be sorted by partition. the scan restarts where
+    # `reset` is true or, when it is not boolean, where its value changes
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    reset = parse_into_expr(reset)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_cum_partitioned",
+        args=[values_expr, partition_id, reset],
+        kwargs={"op": op},
+        is_elementwise=False,
+    )
+
+
+def drawdown_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    method: DrawdownMethod = "fractional",
+) -> pl.Expr:
+    # values are expected to be sorted by partition (then by time).
+    # the result is a struct of the running peak, drawdown and its duration
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_drawdown_partitioned",
+        args=[values_expr, partition_id],
+        kwargs={"method": method},
+        is_elementwise=False,
+    )
+
+
+def limit_change_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    max_change: IntoExpr,
+    method: IntoExpr,
+) -> pl.Expr:
+    # values are expected to be sorted by partition (then by time)
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    max_change = _per_partition(max_change, partition_id).cast(pl.Float64)
+    method = _per_partition(method, partition_id).cast(pl.String)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_limit_change_partitioned",
+        args=[values_expr, partition_id, max_change, method],
+        is_elementwise=False,
+    )
+
+
+def pipeline_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    stages: List[Dict[str, Any]],
+) -> pl.Expr:
+    # values are expected to be sorted by partition. each stage is a dict of
+    # its "op" and parameters, applied in turn to every partition
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_pipeline_partitioned",
+        args=[values_expr, partition_id],
+        kwargs={"stages": stages},
+        is_elementwise=False,
+    )
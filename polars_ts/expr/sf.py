@@ -1,7 +1,7 @@
 from __future__ import annotations
 
 from pathlib import Path
-from typing import TYPE_CHECKING
+from typing import TYPE_CHECKING, Optional
 
 import polars as pl
 
@@ -16,9 +16,12 @@ def handle_null_custom(
     null_strategy: IntoExpr,
     null_param_1: IntoExpr,
 ) -> pl.Expr:
+    # single-series expression, kept as public api for use in user expressions
+    # (e.g. within a group_by or .over()); sf.handle_null and the mathx ops run
+    # through handle_null_partitioned instead
     values_expr = parse_into_expr(values_expr)
     null_strategy = parse_into_expr(null_strategy).cast(pl.String)
-    null_param_1 = parse_into_expr(null_param_1)
+    null_param_1 = parse_into_expr(null_param_1).cast(pl.Float64)
 
     return pl.plugins.register_plugin_function(
         plugin_path=Path(__file__).parent.parent,
@@ -26,3 +29,47 @@ def handle_null_custom(
         args=[values_expr, null_strategy, null_param_1],
         is_elementwise=False,
     )
+
+
+def handle_null_partitioned(
+    values_expr: IntoExpr,
+    partition_id: IntoExpr,
+    null_strategy: IntoExpr,
+    null_param_1: IntoExpr,
+    time: IntoExpr = "time",
+    max_staleness: Optional[str] = None,
+    interpolate_by_time: bool = False,
+) -> pl.Expr:
+    values_expr = parse_into_expr(values_expr)
+    partition_id = parse_into_expr(partition_id)
+    null_strategy = parse_into_expr(null_strategy).cast(pl.String)
+    null_param_1 = parse_into_expr(null_param_1).cast(pl.Float64)
+
+    args = [values_expr, partition_id, null_strategy, null_param_1]
+    if max_staleness is not None or interpolate_by_time:
+        args.append(parse_into_expr(time))
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_handle_null_partitioned",
+        args=args,
+        kwargs={
+            "max_staleness": max_staleness,
+            "interpolate_by_time": interpolate_by_time,
+        },
+        is_elementwise=False,
+    )
+
+
+def assert_single_row(expr: IntoExpr, message: str) -> pl.Expr:
+    # passes `expr` through, failing the query (ComputeError) when it has more
+    # than one row; the check runs inside the plan, nothing is collected for it
+    expr = parse_into_expr(expr)
+
+    return pl.plugins.register_plugin_function(
+        plugin_path=Path(__file__).parent.parent,
+        function_name="pl_assert_single_row",
+        args=[expr],
+        kwargs={"message": message},
+        is_elementwise=False,
+    )
@@ -1,7 +1,59 @@
-from typing import List, Iterable, FrozenSet, Tuple
+from collections import OrderedDict
+from functools import lru_cache
+from typing import Dict, List, Iterable, FrozenSet, Tuple
+import weakref
 from .types import FrameType
 
 import polars as pl
+from polars.type_aliases import PolarsDataType
+
+SCHEMA_CACHE_SIZE = 256
+
+SchemaKey = Tuple[Tuple[str, PolarsDataType], ...]
+
+
+class _SchemaCache:
+    # resolving the schema of a LazyFrame walks its whole plan: remember it
+    # for the most recently seen frames (which are immutable)
+    def __init__(self, maxsize: int) -> None:
+        self._maxsize = maxsize
+        self._entries: OrderedDict[int, Tuple[weakref.ref, SchemaKey]] = OrderedDict()
+
+    def get(self, df: FrameType) -> SchemaKey:
+        if not isinstance(df, pl.LazyFrame):
+            return tuple(df.schema.items())
+
+        key = id(df)
+        entry = self._entries.get(key)
+        # the weak reference guards against the id being reused by a new frame
+        if entry is not None and entry[0]() is df:
+            self._entries.move_to_end(key)
+            return entry[1]
+
+        schema = tuple(df.schema.items())
+        self._entries[key] = (weakref.ref(df), schema)
+        if len(self._entries) > self._maxsize:
+            self._entries.popitem(last=False)
+
+        return schema
+
+    def clear(self) -> None:
+        self._entries.clear()
+
+
+_schema_cache = _SchemaCache(SCHEMA_CACHE_SIZE)
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _resolve_categories(schema: SchemaKey) -> Tuple[str, ...]:
+    return tuple(
+        name for name, dtype in schema if dtype == pl.Categorical or dtype == pl.Enum
+    )
+
+
+@lru_cache(maxsize=SCHEMA_CACHE_SIZE)
+def _resolve_numerics(schema: SchemaKey) -> Tuple[str, ...]:
+    return tuple(name for name, dtype in schema if dtype in pl.NUMERIC_DTYPES)
 
 
 class Grouper:
@@ -116,9 +168,19 @@ class Grouper:
 
         return sorted(cols)
 
+    @staticmethod
+    def schema(df: FrameType) -> Dict[str, PolarsDataType]:
+        return dict(_schema_cache.get(df))
+
+    @staticmethod
+    def clear_cache() -> None:
+        _schema_cache.clear()
+        _resolve_categories.cache_clear()
+        _resolve_numerics.cache_clear()
+
     @staticmethod
     def categories(df: FrameType, include_time: bool) -> List[str]:
-        cols = df.select(pl.col(pl.Categorical, pl.Enum)).columns
+        cols = list(_resolve_categories(_schema_cache.get(df)))
         if include_time:
             cols = ["time"] + sorted(cols)
 
@@ -126,18 +188,24 @@ class Grouper:
 
     @staticmethod
     def columns(df: FrameType, include_time: bool) -> List[str]:
-        cols = df.columns if include_time else df.select(pl.exclude("time")).columns
+        cols = [
+            name for name, _ in _schema_cache.get(df) if include_time or name != "time"
+        ]
         return cols
 
     @staticmethod
     def values(df: FrameType, exclude: List[str]) -> List[str]:
         cats = set(Grouper.categories(df, include_time=True))
-        cols = set(df.columns).difference(cats).difference(exclude)
+        cols = (
+            set(Grouper.columns(df, include_time=True))
+            .difference(cats)
+            .difference(exclude)
+        )
         return sorted(cols)
 
     @staticmethod
     def numerics(df: FrameType, exclude: List[str]) -> List[str]:
-        cols = set(df.select(pl.col(pl.NUMERIC_DTYPES)).columns).difference(exclude)
+        cols = set(_resolve_numerics(_schema_cache.get(df))).difference(exclude)
         return sorted(cols)
 
     def apply(self, *dfs: FrameType) -> List[str]:
@@ -156,15 +224,21 @@ class Grouper:
 
         if self._common:
             df = dfs[0]
-            df_other = dfs[1]
-            df_has_time = ("time" in df) and ("time" in df_other)
-            cols = set(Grouper.common_categories(df, df_other))
+            df_has_time = all(
+                "time" in Grouper.columns(df_other, include_time=True)
+                for df_other in dfs
+            )
+            cols = set(Grouper.common_categories(df, dfs[1]))
+            for df_other in dfs[2:]:
+                cols = cols.intersection(
+                    Grouper.categories(df_other, include_time=False)
+                )
         else:
             if not self._has_defined_spec:
                 self._all = True
 
             df = dfs[0]
-            df_has_time = "time" in df
+            df_has_time = "time" in Grouper.columns(df, include_time=True)
             cols = set(Grouper.categories(df, include_time=False))
 
             if not self._all and len(self._by) > 0:
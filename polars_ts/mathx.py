@@ -1,20 +1,40 @@
-from typing import Any, Generic, Optional
+from typing import Any, Dict, Generic, List, Optional, Tuple, Union
 
 import polars as pl
+from polars.type_aliases import IntoExpr, RankMethod
 
 from .grouper import Grouper
 
 from .sf import SeriesFrame
 from .sf_helper import prepare_params, prepare_result
+from .utils import parse_into_expr
 
 from .mathx_helper import (
     impl_diff,
+    impl_cross_section,
+    impl_cum,
     impl_cum_sum,
+    impl_drawdown,
+    impl_ewm_bank,
+    impl_ewm_cov,
     impl_ewm_mean,
+    impl_ewm_mean_state,
+    impl_limit_change,
+    impl_pipeline,
+    impl_rle,
+    impl_rolling,
+    impl_rolling_pairwise,
     impl_shift,
 )
 
-from .types import FrameType
+from .types import (
+    DrawdownMethod,
+    FrameType,
+    IntervalType,
+    PairwiseStatistic,
+    PipelineOp,
+    RollingStatistic,
+)
 
 __NAMESPACE = "mathx"
 
@@ -45,8 +65,57 @@ class MathxFrame(SeriesFrame, Generic[FrameType]):
         df = impl_diff(self._df, partition, params)
         return prepare_result(df)
 
-    def cum_sum(self, partition: Grouper = Grouper.by_all()) -> FrameType:
-        df = impl_cum_sum(self._df, partition)
+    def cum_sum(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        reset_on: Optional[IntoExpr] = None,
+    ) -> FrameType:
+        # with `reset_on`, the sum restarts at every row where it is true or,
+        # when it is not boolean (e.g. a session column), where its value changes
+        reset_on = parse_into_expr(reset_on) if reset_on is not None else None
+        df = impl_cum_sum(self._df, partition, reset_on)
+        return prepare_result(df)
+
+    def cum_prod(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        reset_on: Optional[IntoExpr] = None,
+    ) -> FrameType:
+        reset_on = parse_into_expr(reset_on) if reset_on is not None else None
+        df = impl_cum(self._df, partition, "prod", reset_on)
+        return prepare_result(df)
+
+    def cum_min(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        reset_on: Optional[IntoExpr] = None,
+    ) -> FrameType:
+        reset_on = parse_into_expr(reset_on) if reset_on is not None else None
+        df = impl_cum(self._df, partition, "min", reset_on)
+        return prepare_result(df)
+
+    def cum_max(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        reset_on: Optional[IntoExpr] = None,
+    ) -> FrameType:
+        reset_on = parse_into_expr(reset_on) if reset_on is not None else None
+        df = impl_cum(self._df, partition, "max", reset_on)
+        return prepare_result(df)
+
+    def drawdown(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        method: DrawdownMethod = "fractional",
+    ) -> FrameType:
+        # adds {col}_peak, {col}_drawdown and {col}_duration (rows since the peak)
+        # for each numeric column
+        df = impl_drawdown(self._df, partition, method)
         return prepare_result(df)
 
     def shift(
@@ -79,7 +148,14 @@ class MathxFrame(SeriesFrame, Generic[FrameType]):
         null_strategy: str = "ignore",
         null_param_1: Any = None,
         params: Optional[FrameType] = None,
+        state: Optional[FrameType] = None,
+        half_life: Optional[str] = None,
     ) -> FrameType:
+        # with a `state` from ewm_mean_state, each partition resumes where that
+        # state left off: only the new rows need to be passed.
+        # with a `half_life` duration ("3d", "30m", "2bd"), the mean decays with
+        # the time elapsed between rows rather than by `alpha` per row
+        decay = {"half_life": (half_life, pl.String)} if half_life is not None else {}
         params = prepare_params(
             self._df,
             params,
@@ -88,7 +164,326 @@ class MathxFrame(SeriesFrame, Generic[FrameType]):
             adjust=(adjust, pl.Categorical),
             null_strategy=(null_strategy, pl.Categorical),
             null_param_1=(null_param_1, pl.Float64),
+            **decay,
         )
 
-        df = impl_ewm_mean(self._df, partition, params)
+        df = impl_ewm_mean(self._df, partition, params, state)
+        return prepare_result(df)
+
+    def ewm_bank(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        alphas: List[float],
+        min_periods: int = 0,
+        adjust: bool = False,
+        null_strategy: str = "ignore",
+        null_param_1: Any = None,
+        params: Optional[FrameType] = None,
+    ) -> FrameType:
+        # ewm_mean for several alphas in a single pass over the values: each
+        # numeric column `c` is replaced by a column `c_ewm_{alpha}` per alpha
+        params = prepare_params(
+            self._df,
+            params,
+            min_periods=(min_periods, pl.Int64),
+            adjust=(adjust, pl.Categorical),
+            null_strategy=(null_strategy, pl.Categorical),
+            null_param_1=(null_param_1, pl.Float64),
+        )
+
+        df = impl_ewm_bank(self._df, partition, params, alphas)
+        return prepare_result(df)
+
+    def pipeline(
+        self,
+        steps: List[Union[PipelineOp, Tuple[PipelineOp, Dict[str, Any]]]],
+        partition: Grouper = Grouper.by_all(),
+        *,
+        null_strategy: str = "ignore",
+        null_param_1: Any = None,
+        params: Optional[FrameType] = None,
+    ) -> FrameType:
+        # chain diff, shift, ewm_mean and cum_sum in a single pass over each
+        # partition, e.g. ["diff", ("ewm_mean", {"alpha": 0.3}), "shift"].
+        # step parameters default as in the matching method and apply to every
+        # partition; nulls are handled once, after the last step
+        params = prepare_params(
+            self._df,
+            params,
+            null_strategy=(null_strategy, pl.Categorical),
+            null_param_1=(null_param_1, pl.Float64),
+        )
+
+        df = impl_pipeline(self._df, partition, params, steps)
+        return prepare_result(df)
+
+    def ewm_mean_state(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        alpha: float = 0.5,
+        adjust: bool = False,
+        params: Optional[FrameType] = None,
+        state: Optional[FrameType] = None,
+    ) -> FrameType:
+        # state of ewm_mean after the last row of each partition: one row per
+        # partition, with a struct of (weight, mean, count) per numeric column
+        params = prepare_params(
+            self._df,
+            params,
+            alpha=(alpha, pl.Float64),
+            adjust=(adjust, pl.Categorical),
+        )
+
+        df = impl_ewm_mean_state(self._df, partition, params, state)
+        return prepare_result(df)
+
+    def limit_change(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        max_change: Optional[float] = None,
+        method: str = "arithmetic",
+        null_strategy: str = "ignore",
+        null_param_1: Any = None,
+        params: Optional[FrameType] = None,
+    ) -> FrameType:
+        # each step moves at most `max_change` from the previous result, or at
+        # most that fraction of it for method="fractional"
+        params = prepare_params(
+            self._df,
+            params,
+            max_change=(max_change, pl.Float64),
+            method=(method, pl.Categorical),
+            null_strategy=(null_strategy, pl.Categorical),
+            null_param_1=(null_param_1, pl.Float64),
+        )
+
+        df = impl_limit_change(self._df, partition, params)
+        return prepare_result(df)
+
+    def rle(self, column: str, partition: Grouper = Grouper.by_all()) -> FrameType:
+        # one row per run of equal values of `column` within each partition:
+        # its run_id, start time, run_length and value. the input must not
+        # already hold run_id or run_length columns
+        df = impl_rle(self._df, partition, column)
+        return prepare_result(df)
+
+    def cs_rank(
+        self, buckets: Optional[Grouper] = None, *, method: RankMethod = "average"
+    ) -> FrameType:
+        # cross-sectional ops are taken across all series at each time or, with
+        # `buckets`, across the series of each bucket. ranks are scaled to (0, 1]
+        df = impl_cross_section(self._df, "rank", buckets, rank_method=method)
+        return prepare_result(df)
+
+    def cs_zscore(self, buckets: Optional[Grouper] = None) -> FrameType:
+        df = impl_cross_section(self._df, "zscore", buckets)
+        return prepare_result(df)
+
+    def cs_demean(self, buckets: Optional[Grouper] = None) -> FrameType:
+        df = impl_cross_section(self._df, "demean", buckets)
+        return prepare_result(df)
+
+    def cs_winsorize(
+        self,
+        buckets: Optional[Grouper] = None,
+        *,
+        lower: float = 0.01,
+        upper: float = 0.99,
+    ) -> FrameType:
+        # values are clipped to the `lower` and `upper` quantiles of their cross-section
+        df = impl_cross_section(
+            self._df, "winsorize", buckets, quantiles=(lower, upper)
+        )
+        return prepare_result(df)
+
+    def neutralize(self, buckets: Grouper) -> FrameType:
+        # removes the mean of each bucket (e.g. Grouper.by("sector")) at each time
+        df = impl_cross_section(self._df, "demean", buckets)
+        return prepare_result(df)
+
+    def ewm_cov(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        alpha: float = 0.5,
+        min_periods: int = 0,
+        adjust: bool = False,
+        suffix: str = "_other",
+        params: Optional[FrameType] = None,
+    ) -> FrameType:
+        # long format: the covariance of each pair of series of `partition`
+        # at each time, time by time with the pairs in row-major order
+        params = prepare_params(
+            self._df,
+            params,
+            alpha=(alpha, pl.Float64),
+            min_periods=(min_periods, pl.Int64),
+            adjust=(adjust, pl.Boolean),
+        )
+
+        df = impl_ewm_cov(self._df, partition, params, correlation=False, suffix=suffix)
+        return prepare_result(df)
+
+    def ewm_corr(
+        self,
+        partition: Grouper = Grouper.by_all(),
+        *,
+        alpha: float = 0.5,
+        min_periods: int = 0,
+        adjust: bool = False,
+        suffix: str = "_other",
+        params: Optional[FrameType] = None,
+    ) -> FrameType:
+        params = prepare_params(
+            self._df,
+            params,
+            alpha=(alpha, pl.Float64),
+            min_periods=(min_periods, pl.Int64),
+            adjust=(adjust, pl.Boolean),
+        )
+
+        df = impl_ewm_cov(self._df, partition, params, correlation=True, suffix=suffix)
+        return prepare_result(df)
+
+    def rolling_sum(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("sum", partition, **kwargs)
+
+    def rolling_mean(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("mean", partition, **kwargs)
+
+    def rolling_var(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("var", partition, **kwargs)
+
+    def rolling_std(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("std", partition, **kwargs)
+
+    def rolling_skew(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("skew", partition, **kwargs)
+
+    def rolling_min(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("min", partition, **kwargs)
+
+    def rolling_max(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("max", partition, **kwargs)
+
+    def rolling_median(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("median", partition, **kwargs)
+
+    def rolling_quantile(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling("quantile", partition, **kwargs)
+
+    def rolling_rank(
+        self, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        # percentile rank of each value within its window, in (0, 1]
+        return self._rolling("rank", partition, **kwargs)
+
+    def rolling_corr(
+        self, other: IntoExpr, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling_pairwise("corr", other, partition, **kwargs)
+
+    def rolling_cov(
+        self, other: IntoExpr, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        return self._rolling_pairwise("cov", other, partition, **kwargs)
+
+    def rolling_beta(
+        self, other: IntoExpr, partition: Grouper = Grouper.by_all(), **kwargs: Any
+    ) -> FrameType:
+        # beta of each series on the series it is paired with
+        return self._rolling_pairwise("beta", other, partition, **kwargs)
+
+    def _rolling(
+        self,
+        statistic: RollingStatistic,
+        partition: Grouper,
+        *,
+        window: Optional[Union[int, str]] = None,
+        min_periods: Optional[int] = None,
+        quantile: float = 0.5,
+        closed: IntervalType = "right",
+        null_strategy: str = "ignore",
+        null_param_1: Any = None,
+        params: Optional[FrameType] = None,
+    ) -> FrameType:
+        # takes the keyword arguments, with their defaults, of every rolling_* method.
+        # an integer window is counted in rows and by default must be full;
+        # a duration ("5m", "20bd") is measured along time, closed as per `closed`
+        period = window if isinstance(window, str) else None
+        window = None if isinstance(window, str) else window
+
+        params = prepare_params(
+            self._df,
+            params,
+            window=(window, pl.Int64),
+            period=(period, pl.String),
+            min_periods=(min_periods, pl.Int64),
+            quantile=(quantile, pl.Float64),
+            null_strategy=(null_strategy, pl.Categorical),
+            null_param_1=(null_param_1, pl.Float64),
+        )
+
+        df = impl_rolling(self._df, partition, params, statistic, closed)
+        return prepare_result(df)
+
+    def _rolling_pairwise(
+        self,
+        statistic: PairwiseStatistic,
+        other: IntoExpr,
+        partition: Grouper,
+        *,
+        window: Optional[Union[int, str]] = None,
+        min_periods: Optional[int] = None,
+        closed: IntervalType = "right",
+        suffix: str = "_other",
+        null_strategy: str = "ignore",
+        null_param_1: Any = None,
+        params: Optional[FrameType] = None,
+    ) -> FrameType:
+        # `other` selects the rows of the series to pair with: every remaining
+        # series of `partition` is matched by time with each of them
+        period = window if isinstance(window, str) else None
+        window = None if isinstance(window, str) else window
+
+        params = prepare_params(
+            self._df,
+            params,
+            window=(window, pl.Int64),
+            period=(period, pl.String),
+            min_periods=(min_periods, pl.Int64),
+            null_strategy=(null_strategy, pl.Categorical),
+            null_param_1=(null_param_1, pl.Float64),
+        )
+
+        df = impl_rolling_pairwise(
+            self._df,
+            parse_into_expr(other),
+            partition,
+            params,
+            statistic,
+            closed,
+            suffix,
+        )
         return prepare_result(df)
@@ -1,12 +1,46 @@
+from typing import Any, Dict, List, Optional, Tuple, Union
+
 import polars as pl
+from polars.type_aliases import RankMethod
 
-from ..expr.mathx import diff_custom, ewm_custom, shift_custom
+from ..expr.mathx import (
+    cum_partitioned,
+    diff_partitioned,
+    drawdown_partitioned,
+    ewm_cov_matrix,
+    ewm_bank_partitioned,
+    ewm_by_time_partitioned,
+    ewm_partitioned,
+    ewm_state_partitioned,
+    limit_change_partitioned,
+    pipeline_partitioned,
+    rolling_pairwise_partitioned,
+    rolling_partitioned,
+    shift_partitioned,
+)
 
-from ..sf_helper import impl_handle_null
+from ..sf_helper import (
+    RESERVED_COL_PREFIX,
+    column_name_unique_over,
+    impl_handle_null,
+    partition_id_name,
+    reserved_columns,
+    scan_in_input_order,
+    with_partition_id,
+)
 from ..grouper import Grouper
 from ..param_schema import ParamSchema
 
-from ..types import FrameType
+from ..types import (
+    CrossSectionOp,
+    CumulativeOp,
+    DrawdownMethod,
+    FrameType,
+    IntervalType,
+    PairwiseStatistic,
+    PipelineOp,
+    RollingStatistic,
+)
 
 
 def impl_diff(
@@ -26,28 +60,218 @@ def impl_diff(
     df_fn, _params, result_cols = ps.apply("diff", df, params)
 
     grouper_cols = partition.apply(df_fn)
-    numeric_cols = partition.numerics(df_fn, exclude=ps.names("*", invert=False))
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df_fn, exclude=ps.names("*", invert=False) + reserved_columns(df_fn)
+    )
 
-    df_fn_result = df_fn.with_columns(
-        diff_custom(
-            pl.col(numeric_cols),
-            "n",
-            "method",
-        ).over(grouper_cols)
-    ).select(result_cols)
+    df_fn_result = (
+        df_fn.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, maintain_order=True)
+        .with_columns(
+            diff_partitioned(
+                pl.col(numeric_cols),
+                partition_id,
+                "n",
+                "method",
+            )
+        )
+        .select(*result_cols, partition_id)
+    )
 
-    _df_null, null_params, result_cols = ps.apply("null", df_fn_result, params)
+    null_params = ps.subset("null", df_fn_result, params)
     df_null_result = impl_handle_null(df_fn_result, partition, null_params)
 
     return df_null_result
 
 
-def impl_cum_sum(df: FrameType, partition: Grouper) -> FrameType:
+def impl_cum_sum(
+    df: FrameType, partition: Grouper, reset_on: Optional[pl.Expr] = None
+) -> FrameType:
+    return impl_cum(df, partition, "sum", reset_on)
+
+
+def impl_cum(
+    df: FrameType,
+    partition: Grouper,
+    op: CumulativeOp,
+    reset_on: Optional[pl.Expr] = None,
+) -> FrameType:
     p = ParamSchema([])
     grouper_cols = partition.apply(df)
-    numeric_cols = partition.numerics(df, exclude=p.names("*", invert=False))
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=p.names("*", invert=False) + reserved_columns(df)
+    )
+
+    if reset_on is not None:
+        return _impl_cum_segmented(df, grouper_cols, numeric_cols, op, reset_on)
+
+    values = pl.col(numeric_cols)
+    cumulative = {
+        "sum": values.cum_sum(),
+        "prod": values.cum_prod(),
+        "min": values.cum_min(),
+        "max": values.cum_max(),
+    }[op]
+
+    result = df.pipe(with_partition_id, grouper_cols).with_columns(
+        cumulative.over(partition_id)
+    )
+
+    return result
+
+
+def _impl_cum_segmented(
+    df: FrameType,
+    grouper_cols: List[str],
+    numeric_cols: List[str],
+    op: CumulativeOp,
+    reset_on: pl.Expr,
+) -> FrameType:
+    # the scan restarts where reset_on is true or, when it is not boolean, where
+    # its value changes. it is evaluated in the order of the frame, before the
+    # partitions are made contiguous, and the rows keep that order like the
+    # unsegmented .over() does
+    partition_id = partition_id_name(grouper_cols)
+    reset = column_name_unique_over("cum_reset", df)
+
+    result = (
+        df.with_columns(reset_on.alias(reset))
+        .pipe(with_partition_id, grouper_cols)
+        .pipe(
+            scan_in_input_order,
+            partition_id,
+            lambda df: df.with_columns(
+                [
+                    cum_partitioned(pl.col(c), partition_id, reset, op)
+                    for c in numeric_cols
+                ]
+            ),
+        )
+        .drop(reset)
+    )
+
+    return result
+
+
+def impl_drawdown(
+    df: FrameType,
+    partition: Grouper,
+    method: DrawdownMethod = "fractional",
+) -> FrameType:
+    p = ParamSchema([])
+    grouper_cols = partition.apply(df)
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=p.names("*", invert=False) + reserved_columns(df)
+    )
+
+    # peak, drawdown and duration of every column come from a single scan,
+    # over each partition in time order
+    has_time = "time" in Grouper.columns(df, include_time=True)
+    sort_by = ["time"] if has_time else []
+    stats = {c: column_name_unique_over(f"drawdown_{c}", df) for c in numeric_cols}
+
+    result = (
+        df.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, *sort_by, maintain_order=True)
+        .with_columns(
+            [
+                drawdown_partitioned(pl.col(c), partition_id, method).alias(stats[c])
+                for c in numeric_cols
+            ]
+        )
+        .with_columns(
+            [
+                pl.col(stats[c]).struct.field(field).alias(f"{c}_{field}")
+                for c in numeric_cols
+                for field in ["peak", "drawdown", "duration"]
+            ]
+        )
+        .drop(list(stats.values()))
+    )
+
+    return result
+
+
+def impl_limit_change(
+    df: FrameType,
+    partition: Grouper,
+    params: FrameType,
+) -> FrameType:
+    ps = ParamSchema(
+        [
+            ("limit_change", "max_change", pl.Float64, None),
+            ("limit_change", "method", pl.Categorical, "arithmetic"),
+            ("null", "null_strategy", pl.Categorical, "ignore"),
+            ("null", "null_param_1", pl.Float64, None),
+        ]
+    )
+
+    df, _params, result_cols = ps.apply("limit_change", df, params)
+    grouper_cols = partition.apply(df)
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
+
+    # each step is limited relative to the previous result, in time order
+    has_time = "time" in Grouper.columns(df, include_time=True)
+    sort_by = ["time"] if has_time else []
+
+    df_fn_result = (
+        df.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, *sort_by, maintain_order=True)
+        .with_columns(
+            limit_change_partitioned(
+                pl.col(numeric_cols),
+                partition_id,
+                "max_change",
+                "method",
+            )
+        )
+        .select(*result_cols, partition_id)
+    )
+
+    null_params = ps.subset("null", df_fn_result, params)
+    df_null_result = impl_handle_null(df_fn_result, partition, null_params)
+
+    return df_null_result
 
-    result = df.with_columns(pl.col(numeric_cols).cum_sum().over(grouper_cols))
+
+def impl_rle(df: FrameType, partition: Grouper, column: str) -> FrameType:
+    # the encoded column is never part of the partition, even if categorical
+    grouper_cols = [c for c in partition.apply(df) if c not in ("time", column)]
+    partition_id = partition_id_name(grouper_cols)
+    has_time = "time" in Grouper.columns(df, include_time=True)
+    sort_by = ["time"] if has_time else []
+
+    # run_id and run_length are reserved names of the result
+    run_id = "run_id"
+    clashing_cols = {run_id, "run_length"}.intersection(
+        Grouper.columns(df, include_time=True)
+    )
+    if len(clashing_cols) > 0:
+        raise ValueError(
+            f"Bad rle invocation. Columns {sorted(clashing_cols)} are reserved for the result"
+        )
+
+    start = ["time"] if has_time else []
+    firsts = [pl.col(c).first() for c in [*grouper_cols, *start]]
+
+    result = (
+        df.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, *sort_by, maintain_order=True)
+        .with_columns(pl.col(column).rle_id().over(partition_id).alias(run_id))
+        .group_by(partition_id, run_id, maintain_order=True)
+        .agg(
+            *firsts,
+            pl.len().alias("run_length"),
+            pl.col(column).first(),
+        )
+        .select(*grouper_cols, run_id, *start, "run_length", column, partition_id)
+    )
 
     return result
 
@@ -67,47 +291,569 @@ def impl_shift(
 
     df, params, result_cols = ps.apply("shift", df, params)
     grouper_cols = partition.apply(df)
-    numeric_cols = partition.numerics(df, exclude=ps.names("*", invert=False))
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
 
-    result = df.with_columns(
-        shift_custom(
-            pl.col(numeric_cols),
-            "n",
-        ).over(grouper_cols)
-    ).select(result_cols)
+    result = (
+        df.pipe(with_partition_id, grouper_cols)
+        .pipe(
+            scan_in_input_order,
+            partition_id,
+            lambda df: df.with_columns(
+                shift_partitioned(
+                    pl.col(numeric_cols),
+                    partition_id,
+                    "n",
+                )
+            ),
+        )
+        .select(*result_cols, partition_id)
+    )
 
     return result
 
 
+_EWM_PARAMS = [
+    ("ewm", "alpha", pl.Float64, 0.5),
+    ("ewm", "min_periods", pl.Int64, 0),
+    ("ewm", "adjust", pl.Int64, 0),
+    ("null", "null_strategy", pl.Categorical, "ignore"),
+    ("null", "null_param_1", pl.Float64, None),
+]
+
+
+def _ewm_state_keys(grouper_cols: List[str]) -> List[str]:
+    # the reserved partition columns are not exported with the state
+    return [c for c in grouper_cols if not c.startswith(RESERVED_COL_PREFIX)]
+
+
+def _with_ewm_state(
+    df: FrameType, grouper_cols: List[str], numeric_cols: List[str], state: FrameType
+) -> Tuple[FrameType, Dict[str, str]]:
+    # the state frame holds a struct per value column, keyed by the partition columns
+    on = _ewm_state_keys(grouper_cols)
+    if isinstance(df, pl.LazyFrame):
+        state = state.lazy()
+
+    seed_cols = {c: column_name_unique_over(f"ewm_state_{c}", df) for c in numeric_cols}
+    state = state.select(
+        *on,
+        *[
+            pl.col(c).alias(seed_cols[c])
+            for c in numeric_cols
+            if c in Grouper.columns(state, include_time=True)
+        ],
+    )
+
+    if len(on) > 0:
+        df = df.join(state, on=on, how="left")
+    else:
+        df = df.join(state, how="cross")
+
+    seed_cols = {
+        c: seed
+        for c, seed in seed_cols.items()
+        if seed in Grouper.columns(df, include_time=True)
+    }
+    return df, seed_cols
+
+
 def impl_ewm_mean(
     df: FrameType,
     partition: Grouper,
     params: FrameType,
+    state: Optional[FrameType] = None,
+) -> FrameType:
+    # with a half_life, the mean decays with the time elapsed between rows
+    by_time = "half_life" in Grouper.columns(params, include_time=True)
+    if by_time and "time" not in Grouper.columns(df, include_time=True):
+        raise ValueError(
+            "Bad ewm_mean invocation. A half_life decays along time, which is missing"
+        )
+    if by_time and state is not None:
+        raise ValueError(
+            "Bad ewm_mean invocation. A half_life cannot resume from a state"
+        )
+
+    ps = ParamSchema(
+        _EWM_PARAMS + ([("ewm", "half_life", pl.String, None)] if by_time else [])
+    )
+
+    df, _params, result_cols = ps.apply("ewm", df, params)
+    grouper_cols = partition.apply(df)
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
+
+    seed_cols: Dict[str, str] = dict()
+    if state is not None:
+        df, seed_cols = _with_ewm_state(df, grouper_cols, numeric_cols, state)
+
+    def ewm(c: str) -> pl.Expr:
+        if by_time:
+            return ewm_by_time_partitioned(
+                pl.col(c),
+                partition_id,
+                "time",
+                "alpha",
+                "half_life",
+                "min_periods",
+                "adjust",
+            )
+        return ewm_partitioned(
+            pl.col(c),
+            partition_id,
+            "alpha",
+            "min_periods",
+            "adjust",
+            state=seed_cols.get(c),
+        )
+
+    sort_by = ["time"] if by_time else []
+
+    df_fn_result = (
+        df.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, *sort_by, maintain_order=True)
+        .with_columns([ewm(c) for c in numeric_cols])
+        .select(*result_cols, partition_id)
+    )
+
+    null_params = ps.subset("null", df_fn_result, params)
+    df_null_result = impl_handle_null(df_fn_result, partition, null_params)
+
+    return df_null_result
+
+
+def impl_ewm_bank(
+    df: FrameType,
+    partition: Grouper,
+    params: FrameType,
+    alphas: List[float],
+) -> FrameType:
+    if len(alphas) == 0:
+        raise ValueError("Bad ewm_bank invocation. At least one alpha is required")
+
+    ps = ParamSchema([p for p in _EWM_PARAMS if p[1] != "alpha"])
+
+    df, _params, result_cols = ps.apply("ewm", df, params)
+    grouper_cols = partition.apply(df)
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
+
+    # each value column is read once and replaced by one column per alpha
+    bank_cols = {c: [f"{c}_ewm_{alpha}" for alpha in alphas] for c in numeric_cols}
+    result_cols = [b for c in result_cols for b in bank_cols.get(c, [c])]
+
+    df_fn_result = (
+        df.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, maintain_order=True)
+        .with_columns(
+            [
+                ewm_bank_partitioned(
+                    pl.col(c), partition_id, alphas, "min_periods", "adjust"
+                )
+                for c in numeric_cols
+            ]
+        )
+        .with_columns(
+            [
+                pl.col(c).list.get(k).alias(name)
+                for c, names in bank_cols.items()
+                for k, name in enumerate(names)
+            ]
+        )
+        .select(*result_cols, partition_id)
+    )
+
+    null_params = ps.subset("null", df_fn_result, params)
+    df_null_result = impl_handle_null(df_fn_result, partition, null_params)
+
+    return df_null_result
+
+
+def impl_ewm_mean_state(
+    df: FrameType,
+    partition: Grouper,
+    params: FrameType,
+    state: Optional[FrameType] = None,
+) -> FrameType:
+    ps = ParamSchema(_EWM_PARAMS)
+
+    df, _params, _result_cols = ps.apply("ewm", df, params)
+    grouper_cols = partition.apply(df)
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
+
+    seed_cols: Dict[str, str] = dict()
+    if state is not None:
+        df, seed_cols = _with_ewm_state(df, grouper_cols, numeric_cols, state)
+
+    df = df.pipe(with_partition_id, grouper_cols).sort(
+        partition_id, maintain_order=True
+    )
+
+    # one row per partition, in the order the kernel visits them
+    states = df.select(
+        pl.col(partition_id).unique(maintain_order=True),
+        *[
+            ewm_state_partitioned(
+                pl.col(c), partition_id, "alpha", "adjust", state=seed_cols.get(c)
+            )
+            for c in numeric_cols
+        ],
+    )
+    keys = df.select(*grouper_cols, partition_id).unique(
+        subset=partition_id, maintain_order=True
+    )
+
+    result = states.join(keys, on=partition_id, how="left").select(
+        *grouper_cols, *numeric_cols
+    )
+
+    # partitions without new rows keep their state
+    on = _ewm_state_keys(grouper_cols)
+    if state is not None and len(on) > 0:
+        if isinstance(result, pl.LazyFrame):
+            state = state.lazy()
+        carried = state.join(result.select(on), on=on, how="anti")
+        result = pl.concat([result, carried], how="diagonal")
+
+    return result
+
+
+def impl_ewm_cov(
+    df: FrameType,
+    partition: Grouper,
+    params: FrameType,
+    correlation: bool = False,
+    suffix: str = "_other",
 ) -> FrameType:
     ps = ParamSchema(
         [
             ("ewm", "alpha", pl.Float64, 0.5),
             ("ewm", "min_periods", pl.Int64, 0),
-            ("ewm", "adjust", pl.Int64, 0),
+            ("ewm", "adjust", pl.Boolean, False),
+        ]
+    )
+
+    name = "ewm_corr" if correlation else "ewm_cov"
+    if "time" not in Grouper.columns(df, include_time=True):
+        raise ValueError(
+            f"Bad {name} invocation. The matrix is taken at each time, which is missing"
+        )
+
+    df, _params, _result_cols = ps.apply("ewm", df, params)
+    series_cols = [c for c in partition.apply(df) if c != "time"]
+    series_id = partition_id_name(series_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=["time"] + ps.names("*", invert=False) + reserved_columns(df)
+    )
+    other_series_cols = [f"{c}{suffix}" for c in series_cols]
+
+    df = df.pipe(with_partition_id, series_cols).sort("time", series_id)
+
+    row_idx = column_name_unique_over("matrix_index", df)
+    time_idx = column_name_unique_over("time_index", df)
+    other_series_id = column_name_unique_over("other_series_id", df)
+    n = column_name_unique_over("series_count", df)
+
+    # one matrix per distinct time, each N x N and row-major
+    matrices = (
+        df.select(
+            [
+                ewm_cov_matrix(
+                    pl.col(c),
+                    series_id,
+                    "time",
+                    "alpha",
+                    "min_periods",
+                    "adjust",
+                    correlation=correlation,
+                )
+                for c in numeric_cols
+            ]
+        )
+        .with_row_index(row_idx)
+        .join(df.select(pl.col(series_id).n_unique().alias(n)), how="cross")
+        .with_columns(
+            (pl.col(row_idx) // (pl.col(n) * pl.col(n))).alias(time_idx),
+            ((pl.col(row_idx) // pl.col(n)) % pl.col(n)).alias(series_id),
+            (pl.col(row_idx) % pl.col(n)).alias(other_series_id),
+        )
+    )
+
+    times = df.select(pl.col("time").unique(maintain_order=True)).with_row_index(
+        time_idx
+    )
+    series = df.select(*series_cols, series_id).unique(
+        subset=series_id, maintain_order=True
+    )
+    other_series = series.select(
+        *[pl.col(c).alias(f"{c}{suffix}") for c in series_cols],
+        pl.col(series_id).alias(other_series_id),
+    )
+
+    result = (
+        matrices.with_columns(
+            pl.col(time_idx, series_id, other_series_id).cast(pl.UInt32)
+        )
+        .join(times, on=time_idx, how="left")
+        .join(series, on=series_id, how="left")
+        .join(other_series, on=other_series_id, how="left")
+        .select("time", *series_cols, *other_series_cols, *numeric_cols)
+    )
+
+    return result
+
+
+def impl_rolling(
+    df: FrameType,
+    partition: Grouper,
+    params: FrameType,
+    statistic: RollingStatistic,
+    closed: IntervalType = "right",
+) -> FrameType:
+    ps = ParamSchema(
+        [
+            ("rolling", "window", pl.Int64, None),
+            ("rolling", "period", pl.String, None),
+            ("rolling", "min_periods", pl.Int64, None),
+            ("rolling", "quantile", pl.Float64, 0.5),
             ("null", "null_strategy", pl.Categorical, "ignore"),
             ("null", "null_param_1", pl.Float64, None),
         ]
     )
 
-    df, _params, result_cols = ps.apply("ewm", df, params)
+    df, _params, result_cols = ps.apply("rolling", df, params)
     grouper_cols = partition.apply(df)
-    numeric_cols = partition.numerics(df, exclude=ps.names("*", invert=False))
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
 
-    df_fn_result = df.with_columns(
-        ewm_custom(
-            pl.col(numeric_cols),
-            "alpha",
-            "min_periods",
-            "adjust",
-        ).over(grouper_cols)
-    ).select(result_cols)
+    # a period is measured along time, so partitions are scanned in time order
+    has_time = "time" in Grouper.columns(df, include_time=True)
+    sort_by = ["time"] if has_time else []
+
+    df_fn_result = (
+        df.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, *sort_by, maintain_order=True)
+        .with_columns(
+            rolling_partitioned(
+                pl.col(numeric_cols),
+                partition_id,
+                "window",
+                "min_periods",
+                "quantile",
+                "period",
+                statistic,
+                closed=closed,
+                time="time" if has_time else None,
+            )
+        )
+        .select(*result_cols, partition_id)
+    )
+
+    null_params = ps.subset("null", df_fn_result, params)
+    df_null_result = impl_handle_null(df_fn_result, partition, null_params)
+
+    return df_null_result
 
-    _df_null, null_params, result_cols = ps.apply("null", df_fn_result, params)
+
+def impl_rolling_pairwise(
+    df: FrameType,
+    other: pl.Expr,
+    partition: Grouper,
+    params: FrameType,
+    statistic: PairwiseStatistic,
+    closed: IntervalType = "right",
+    suffix: str = "_other",
+) -> FrameType:
+    ps = ParamSchema(
+        [
+            ("rolling", "window", pl.Int64, None),
+            ("rolling", "period", pl.String, None),
+            ("rolling", "min_periods", pl.Int64, None),
+            ("null", "null_strategy", pl.Categorical, "ignore"),
+            ("null", "null_param_1", pl.Float64, None),
+        ]
+    )
+
+    if "time" not in Grouper.columns(df, include_time=True):
+        raise ValueError(
+            f"Bad rolling_{statistic} invocation. Series are matched by time, which is missing"
+        )
+
+    series_cols = [c for c in partition.apply(df) if c != "time"]
+    numeric_cols = partition.numerics(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
+    other_series_cols = [f"{c}{suffix}" for c in series_cols]
+
+    # the rows selected by `other` are the series every other series is paired with
+    others = df.filter(other).select(
+        "time", *[pl.col(c).alias(f"{c}{suffix}") for c in series_cols + numeric_cols]
+    )
+    df, _params, result_cols = ps.apply("rolling", df.filter(~other), params)
+
+    # each pair is aligned once, by time, then walked as a contiguous run of rows
+    pair_cols = sorted(series_cols + other_series_cols)
+    partition_id = partition_id_name(pair_cols)
+
+    df_fn_result = (
+        df.join(others, on="time", how="inner")
+        .pipe(with_partition_id, pair_cols)
+        .sort(partition_id, "time", maintain_order=True)
+        .with_columns(
+            [
+                rolling_pairwise_partitioned(
+                    pl.col(c),
+                    pl.col(f"{c}{suffix}"),
+                    partition_id,
+                    "window",
+                    "min_periods",
+                    "period",
+                    statistic,
+                    closed=closed,
+                    time="time",
+                )
+                for c in numeric_cols
+            ]
+        )
+        .select(*result_cols, *other_series_cols, partition_id)
+    )
+
+    null_params = ps.subset("null", df_fn_result, params)
+    df_null_result = impl_handle_null(df_fn_result, Grouper.by(*pair_cols), null_params)
+
+    return df_null_result
+
+
+# parameters of each pipeline stage, with the defaults of the matching method
+_PIPELINE_STAGES: Dict[str, Dict[str, Any]] = {
+    "diff": {"n": 1, "method": "arithmetic"},
+    "shift": {"n": 1},
+    "ewm_mean": {"alpha": 0.5, "min_periods": 0, "adjust": False},
+    "cum_sum": {},
+}
+
+
+def _pipeline_stages(
+    steps: List[Union[PipelineOp, Tuple[PipelineOp, Dict[str, Any]]]],
+) -> List[Dict[str, Any]]:
+    stages = []
+    for step in steps:
+        op, kwargs = (step, {}) if isinstance(step, str) else step
+        if op not in _PIPELINE_STAGES:
+            raise ValueError(
+                f"Bad pipeline invocation. Unknown step {op}, "
+                f"expected one of {list(_PIPELINE_STAGES)}"
+            )
+
+        defaults = _PIPELINE_STAGES[op]
+        unknown = set(kwargs) - set(defaults)
+        if len(unknown) > 0:
+            raise ValueError(
+                f"Bad pipeline invocation. Unknown parameters {sorted(unknown)} "
+                f"for step {op}"
+            )
+
+        stage = {**defaults, **kwargs}
+        stages.append(
+            {
+                "op": op,
+                **{
+                    k: type(defaults[k])(v) if v is not None else v
+                    for k, v in stage.items()
+                },
+            }
+        )
+
+    return stages
+
+
+def impl_pipeline(
+    df: FrameType,
+    partition: Grouper,
+    params: FrameType,
+    steps: List[Union[PipelineOp, Tuple[PipelineOp, Dict[str, Any]]]],
+) -> FrameType:
+    stages = _pipeline_stages(steps)
+
+    ps = ParamSchema(
+        [
+            ("null", "null_strategy", pl.Categorical, "ignore"),
+            ("null", "null_param_1", pl.Float64, None),
+        ]
+    )
+
+    result_cols = Grouper.columns(df, include_time=True)
+    grouper_cols = partition.apply(df)
+    partition_id = partition_id_name(grouper_cols)
+    numeric_cols = partition.numerics(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
+
+    # every column goes through all the stages in a single kernel call, so the
+    # frame is partitioned once and nulls are handled once, after the last stage
+    df_fn_result = (
+        df.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, maintain_order=True)
+        .with_columns(
+            [
+                pipeline_partitioned(pl.col(c), partition_id, stages)
+                for c in numeric_cols
+            ]
+        )
+        .select(*result_cols, partition_id)
+    )
+
+    null_params = ps.subset("null", df_fn_result, params)
     df_null_result = impl_handle_null(df_fn_result, partition, null_params)
 
     return df_null_result
+
+
+def impl_cross_section(
+    df: FrameType,
+    op: CrossSectionOp,
+    buckets: Optional[Grouper] = None,
+    rank_method: RankMethod = "average",
+    quantiles: Tuple[float, float] = (0.01, 0.99),
+) -> FrameType:
+    if "time" not in Grouper.columns(df, include_time=True):
+        raise ValueError(
+            f"Bad cs_{op} invocation. The cross-section is taken at each time, "
+            "which is missing"
+        )
+
+    # polars window expressions group by hash and run in parallel, so the
+    # cross-sections are computed without sorting and the rows keep their order
+    bucket_cols = [] if buckets is None else buckets.apply(df)
+    over = ["time"] + [c for c in bucket_cols if c != "time"]
+    numeric_cols = Grouper.numerics(df, exclude=reserved_columns(df))
+
+    def cross_section(x: pl.Expr) -> pl.Expr:
+        if op == "rank":
+            return x.rank(rank_method) / x.count()
+        if op == "zscore":
+            return (x - x.mean()) / x.std()
+        if op == "demean":
+            return x - x.mean()
+        if op == "winsorize":
+            lower, upper = quantiles
+            return x.clip(x.quantile(lower, "linear"), x.quantile(upper, "linear"))
+        raise ValueError(f"Bad cross-section invocation. Unknown op {op}")
+
+    result = df.with_columns(
+        [cross_section(pl.col(c)).over(over).alias(c) for c in numeric_cols]
+    )
+
+    return result
@@ -4,6 +4,7 @@ from typing import Any, Dict, List, Tuple, Optional, Set
 import polars as pl
 from polars.type_aliases import JoinStrategy
 
+from .expr.sf import assert_single_row
 from .grouper import Grouper
 from .types import cast_dtype, FrameType
 
@@ -107,7 +108,9 @@ class ParamSchema:
             p.name for p in self._required_params(group_key, invert=False)
         ]
 
-        missing_required_params = set(required_param_names).difference(params.columns)
+        missing_required_params = set(required_param_names).difference(
+            Grouper.columns(params, include_time=True)
+        )
         if len(missing_required_params) > 0:
             raise ValueError(f"Missing required parameters: {missing_required_params}")
 
@@ -115,7 +118,7 @@ class ParamSchema:
 
         mismatch_param_dtype = [
             (name, dtype, full_schema[name])
-            for name, dtype in df.schema.items()
+            for name, dtype in Grouper.schema(df).items()
             if name in full_schema and dtype != full_schema[name]
         ]
 
@@ -133,18 +136,18 @@ class ParamSchema:
         ).unique(maintain_order=True)
         return result
 
-    def apply(
-        self, group_key: str, df: FrameType, params: FrameType
-    ) -> Tuple[FrameType, FrameType, List[str]]:
+    def subset(self, group_key: str, df: FrameType, params: FrameType) -> FrameType:
         params_subset = self._subset_params(group_key, params)
         self._validate(group_key, df, params_subset)
 
         # add optional parameters that weren't supplied in params
         optional_params = self._optional_params(group_key, invert=False)
         # optional_param_names = [p.name for p in self._optional_params(group_key)]
-        missing_optional_params = {
-            p for p in optional_params if p.name not in params_subset.columns
-        }
+        missing_optional_params = [
+            p
+            for p in optional_params
+            if p.name not in Grouper.columns(params_subset, include_time=True)
+        ]
 
         if len(missing_optional_params) > 0:
             params_subset = params_subset.with_columns(
@@ -158,6 +161,15 @@ class ParamSchema:
             [cast_dtype(pl.col(name), dtype) for name, dtype in full_schema.items()]
         )
 
+        return params_subset
+
+    def apply(
+        self, group_key: str, df: FrameType, params: FrameType
+    ) -> Tuple[FrameType, FrameType, List[str]]:
+        params_subset = self.subset(group_key, df, params)
+        optional_params = self._optional_params(group_key, invert=False)
+        full_schema = self._full_schema(group_key, invert=False)
+
         # if the parameter exists in df and in the params frames, then
         # prefer the df. This is because the params could just be default parameters
         # print a warning?
@@ -170,18 +182,16 @@ class ParamSchema:
         if len(common_cats) == 0:
             join_type: JoinStrategy = "cross"
 
-            df_schema_params = set(df.columns).intersection(
+            df_schema_params = set(Grouper.columns(df, include_time=True)).intersection(
                 self.names(group_key, invert=False)
             )
             non_schema_params = (
-                set(params_subset.columns)
+                set(Grouper.columns(params_subset, include_time=True))
                 .difference(self.names(group_key, invert=False))
                 .union(df_schema_params)
             )
-            if len(params_subset.lazy().collect()) > 1 and len(non_schema_params) == 0:
-                raise ValueError(
-                    "supplied multiple params without any categories. suggestion: add categories to params."
-                )
+            if len(non_schema_params) == 0:
+                params_subset = _with_single_row_check(params_subset)
         else:
             join_type = "left"
 
@@ -201,7 +211,7 @@ class ParamSchema:
             if p not in full_schema.keys()
         ]
         result_cols = (
-            pl.Series(values=df.columns + param_cols)
+            pl.Series(values=Grouper.columns(df, include_time=True) + param_cols)
             .unique(maintain_order=True)
             .to_list()
         )
@@ -234,3 +244,14 @@ class ParamSchema:
         rep = f"{class_name}<{group_parts_str}>"
 
         return rep
+
+
+def _with_single_row_check(params: FrameType) -> FrameType:
+    message = "supplied multiple params without any categories. suggestion: add categories to params."
+    if isinstance(params, pl.DataFrame):
+        if params.height > 1:
+            raise ValueError(message)
+        return params
+
+    # a lazy params plan is checked as part of the query, when it is collected
+    return params.with_columns(assert_single_row(pl.all(), message))
@@ -1,4 +1,4 @@
-from typing import Literal, Generic
+from typing import Literal, Generic, Optional
 
 import polars as pl
 
@@ -12,7 +12,7 @@ from .resample_helper import (
 
 from .grouper import Grouper
 from .tsf import TimeSeriesFrame
-from .types import IntervalType, FrameType, SentinelNumeric
+from .types import IntervalType, InterpolateByType, FrameType, SentinelNumeric
 
 __NAMESPACE = "rs"
 
@@ -50,10 +50,19 @@ class ResampleFrame(TimeSeriesFrame, Generic[FrameType]):
         partition: Grouper = Grouper.by_all(),
         closed: IntervalType = "left",
         null_strategy: str = "forward",
-        null_param_1: SentinelNumeric = 0.0,
+        null_param_1: Optional[SentinelNumeric] = 0.0,
+        max_staleness: Optional[str] = None,
+        interpolate_by: InterpolateByType = "row",
     ) -> FrameType:
         df = impl_align_to_time(
-            self._df, time_axis, partition, closed, null_strategy, null_param_1
+            self._df,
+            time_axis,
+            partition,
+            closed,
+            null_strategy,
+            null_param_1,
+            max_staleness,
+            interpolate_by,
         )
 
         return prepare_result(df)
@@ -74,7 +83,9 @@ class ResampleFrame(TimeSeriesFrame, Generic[FrameType]):
         partition: Grouper = Grouper.by_all(),
         retain_values: Literal["lhs", "rhs", "both"] = "lhs",
         null_strategy: str = "forward",
-        null_param_1: SentinelNumeric = 0.0,
+        null_param_1: Optional[SentinelNumeric] = 0.0,
+        max_staleness: Optional[str] = None,
+        interpolate_by: InterpolateByType = "row",
     ) -> FrameType:
         df = impl_align_values(
             self._df,
@@ -83,6 +94,8 @@ class ResampleFrame(TimeSeriesFrame, Generic[FrameType]):
             retain_values,
             null_strategy,
             null_param_1,
+            max_staleness,
+            interpolate_by,
         )
 
         return prepare_result(df)
@@ -1,3 +1,5 @@
+from typing import Optional
+
 import polars as pl
 
 from ..sf_helper import impl_handle_null
@@ -5,6 +7,7 @@ from ..grouper import Grouper
 
 from ..types import (
     IntervalType,
+    InterpolateByType,
     RetainValuesType,
     FrameType,
     SentinelNumeric,
@@ -17,7 +20,9 @@ def impl_align_to_time(
     partition: Grouper,
     closed: IntervalType,
     null_strategy: str,
-    null_param_1: SentinelNumeric,
+    null_param_1: Optional[SentinelNumeric],
+    max_staleness: Optional[str] = None,
+    interpolate_by: InterpolateByType = "row",
 ) -> FrameType:
     resampled = impl_resample_categories(df, time_axis, partition, closed)
     realigned = impl_align_values(
@@ -27,6 +32,8 @@ def impl_align_to_time(
         retain_values="lhs",
         null_strategy=null_strategy,
         null_param_1=null_param_1,
+        max_staleness=max_staleness,
+        interpolate_by=interpolate_by,
     )
 
     return realigned
@@ -74,7 +81,9 @@ def impl_align_values(
     partition: Grouper,
     retain_values: RetainValuesType,
     null_strategy: str,
-    null_param_1: SentinelNumeric,
+    null_param_1: Optional[SentinelNumeric],
+    max_staleness: Optional[str] = None,
+    interpolate_by: InterpolateByType = "row",
 ) -> FrameType:
     rhs_cat_cols = Grouper.categories(rhs, include_time=True)
     rhs_grid = rhs.select(rhs_cat_cols)
@@ -102,7 +111,9 @@ def impl_align_values(
         null_param_1=pl.lit(null_param_1).cast(pl.Float64),
     )
 
-    result = impl_handle_null(result, partition, null_params)
+    result = impl_handle_null(
+        result, partition, null_params, max_staleness, interpolate_by
+    )
 
     result = result.join(rhs_grid, on=rhs_cat_cols, how="inner")
 
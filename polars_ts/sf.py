@@ -1,4 +1,4 @@
-from typing import Any, Generic, Optional
+from typing import Any, Generic, List, Optional
 
 import polars as pl
 from polars.type_aliases import IntoExpr, JoinStrategy
@@ -7,13 +7,22 @@ from .grouper import Grouper
 from .sf_helper import (
     impl_handle_null,
     impl_join,
+    impl_join_interval,
+    impl_join_many,
     impl_join_on_list_items,
     impl_unique,
     prepare_params,
     prepare_result,
     RESERVED_ALL_GRP,
 )
-from .types import FrameType
+from .types import (
+    AsofStrategyType,
+    FrameType,
+    IntervalType,
+    InterpolateByType,
+    JoinManyStrategy,
+    SeriesJoinStrategy,
+)
 from .utils import parse_into_expr
 
 __NAMESPACE = "sf"
@@ -30,9 +39,35 @@ class SeriesFrame(Generic[FrameType]):
         self,
         other: FrameType,
         grouper: Grouper = Grouper.by_common_including_time(),
-        how: JoinStrategy = "inner",
+        how: SeriesJoinStrategy = "inner",
+        *,
+        asof_strategy: AsofStrategyType = "backward",
+        tolerance: Optional[str] = None,
+    ) -> FrameType:
+        df = impl_join(self._df, other, grouper, how, asof_strategy, tolerance)
+        return prepare_result(df)
+
+    def join_many(
+        self,
+        others: List[FrameType],
+        grouper: Grouper = Grouper.by_common_including_time(),
+        how: JoinManyStrategy = "inner",
     ) -> FrameType:
-        df = impl_join(self._df, other, grouper, how)
+        df = impl_join_many(self._df, others, grouper, how)
+        return prepare_result(df)
+
+    def join_interval(
+        self,
+        other: FrameType,
+        start: str = "start",
+        end: str = "end",
+        grouper: Grouper = Grouper.by_common_excluding_time(),
+        closed: IntervalType = "both",
+    ) -> FrameType:
+        other = other.with_columns(
+            pl.lit("_placeholder_").cast(pl.Categorical).alias(RESERVED_ALL_GRP)
+        )
+        df = impl_join_interval(self._df, other, start, end, grouper, closed)
         return prepare_result(df)
 
     def unique(self, grouper: Grouper = Grouper.by_time_and_all()) -> FrameType:
@@ -45,6 +80,8 @@ class SeriesFrame(Generic[FrameType]):
         *,
         null_strategy: str = "ignore",
         null_param_1: Any = None,
+        max_staleness: Optional[str] = None,
+        interpolate_by: InterpolateByType = "row",
         params: Optional[FrameType] = None,
     ) -> FrameType:
         params = prepare_params(
@@ -53,7 +90,9 @@ class SeriesFrame(Generic[FrameType]):
             null_strategy=(null_strategy, pl.Categorical),
             null_param_1=(null_param_1, pl.Float64),
         )
-        df = impl_handle_null(self._df, partition, params)
+        df = impl_handle_null(
+            self._df, partition, params, max_staleness, interpolate_by
+        )
         return prepare_result(df)
 
     def join_on_list_items(
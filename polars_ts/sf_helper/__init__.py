@@ -1,9 +1,18 @@
-from typing import Any, List, Optional
+from typing import Any, Callable, List, Optional
 
 import polars as pl
 from polars.type_aliases import JoinStrategy
 
-from ..types import cast_dtype, FrameType
+from ..expr.sf import handle_null_partitioned
+from ..types import (
+    cast_dtype,
+    AsofStrategyType,
+    FrameType,
+    IntervalType,
+    InterpolateByType,
+    JoinManyStrategy,
+    SeriesJoinStrategy,
+)
 from ..grouper import Grouper
 from ..param_schema import ParamSchema
 
@@ -11,6 +20,7 @@ RESERVED_COL_PREFIX = "##@_"
 RESERVED_COL_REGEX = "^##@_.*$"
 RESERVED_ALL_GRP = f"{RESERVED_COL_PREFIX}_GRP_ALL"
 RESERVED_ROW_IDX = f"{RESERVED_COL_PREFIX}_INDEX"
+RESERVED_PARTITION_ID = f"{RESERVED_COL_PREFIX}_PARTITION_ID"
 RESERVED_DELIMITER = "##@"
 
 
@@ -22,57 +32,84 @@ def prepare_params(
     df: FrameType, params: Optional[FrameType], **kwargs: Any
 ) -> FrameType:
     if params is None:
-        params = df.clear().select()
+        # built from literals alone, so never depends on the plan of `df`
+        params = pl.LazyFrame() if isinstance(df, pl.LazyFrame) else pl.DataFrame()
 
     params = params.with_columns(
         [
             cast_dtype(pl.lit(value), dtype).alias(name)
             for name, (value, dtype) in kwargs.items()
-            if name not in params.columns
+            if name not in Grouper.columns(params, include_time=True)
         ]
     )
 
     return params
 
 
-def _handle_null_helper(df: FrameType, value_cols: List[str]) -> FrameType:
-    first_row = df.lazy().head(1).collect()
-    null_strategy = first_row.item(0, "null_strategy")
-
-    match null_strategy:
-        case "sentinel":
-            sentinel_value = first_row.item(0, "null_param_1")
-            result = df.with_columns(pl.col(value_cols).fill_null(sentinel_value))
-        case "forward":
-            fill_limit = int(first_row.item(0, "null_param_1"))
-            result = df.with_columns(pl.col(value_cols).forward_fill(fill_limit))
-        case "backward":
-            fill_limit = int(first_row.item(0, "null_param_1"))
-            result = df.with_columns(pl.col(value_cols).backward_fill(fill_limit))
-        case "interpolate_linear":
-            result = df.with_columns(pl.col(value_cols).interpolate(method="linear"))
-        case "interpolate_nearest":
-            result = df.with_columns(pl.col(value_cols).interpolate(method="nearest"))
-        case "min":
-            result = df.with_columns(pl.col(value_cols).fill_null(strategy="min"))
-        case "max":
-            result = df.with_columns(pl.col(value_cols).fill_null(strategy="max"))
-        case "mean":
-            result = df.with_columns(pl.col(value_cols).fill_null(strategy="mean"))
-        case "ignore":
-            result = df
-        case "trim_start_n":
-            n = int(first_row.item(0, "null_param_1"))
-            result = df.slice(n)
-        case "trim_end_n":
-            n = int(first_row.item(0, "null_param_1"))
-            result = df.reverse().slice(n).reverse()
-        case "drop_if_all":
-            result = df.filter(pl.all_horizontal(pl.col(value_cols).is_not_null()))
-        case "drop_if_any":
-            result = df.filter(pl.any_horizontal(pl.col(value_cols).is_not_null()))
-        case _:
-            raise ValueError(f"Unknown null_strategy {null_strategy}")
+def partition_id_name(grouper_cols: List[str]) -> str:
+    return f"{RESERVED_PARTITION_ID}[{','.join(grouper_cols)}]"
+
+
+def with_partition_id(df: FrameType, grouper_cols: List[str]) -> FrameType:
+    # UInt32 id of each partition: the row index of its first row, so the ids
+    # sort in order of first appearance without being ranked. within one call
+    # it is computed once and reused by the later steps over the same partition
+    # (e.g. the null handling after a kernel), which then group on a single
+    # integer key. prepare_result strips it like any reserved
+    # column, so it is not carried over from one namespace call to the next
+    partition_id = partition_id_name(grouper_cols)
+    if partition_id in Grouper.columns(df, include_time=True):
+        return df
+
+    # without grouper columns the whole frame is a single partition
+    if len(grouper_cols) == 0:
+        return df.with_columns(pl.lit(0, dtype=pl.UInt32).alias(partition_id))
+
+    row_idx = column_name_unique_over("partition_row_index", df)
+    df = (
+        df.with_row_index(row_idx)
+        .with_columns(pl.col(row_idx).first().over(grouper_cols).alias(partition_id))
+        .drop(row_idx)
+    )
+
+    return df
+
+
+def scan_in_input_order(
+    df: FrameType, partition_id: str, scan: Callable[[FrameType], FrameType]
+) -> FrameType:
+    # the kernels walk each partition as a contiguous run of rows. for the ops
+    # that otherwise keep the rows of `df` in place (like an `.over()` would),
+    # the rows are put back in their input order once `scan` is done
+    row_idx = column_name_unique_over("input_row_index", df)
+    result = (
+        df.with_row_index(row_idx)
+        .sort(partition_id, maintain_order=True)
+        .pipe(scan)
+        .sort(row_idx)
+        .drop(row_idx)
+    )
+
+    return result
+
+
+def _handle_null_row_filter(partition_id: str, value_cols: List[str]) -> pl.Expr:
+    null_strategy = pl.col("null_strategy").cast(pl.String)
+    n = pl.col("null_param_1")
+    row_number = pl.int_range(0, pl.len()).over(partition_id)
+    row_number_from_end = pl.int_range(0, pl.len()).reverse().over(partition_id)
+
+    result = (
+        pl.when(null_strategy == "trim_start_n")
+        .then(row_number >= n)
+        .when(null_strategy == "trim_end_n")
+        .then(row_number_from_end >= n)
+        .when(null_strategy == "drop_if_all")
+        .then(pl.all_horizontal(pl.col(value_cols).is_not_null()))
+        .when(null_strategy == "drop_if_any")
+        .then(pl.any_horizontal(pl.col(value_cols).is_not_null()))
+        .otherwise(True)
+    )
 
     return result
 
@@ -81,6 +118,8 @@ def impl_handle_null(
     df: FrameType,
     partition: Grouper,
     params: FrameType,
+    max_staleness: Optional[str] = None,
+    interpolate_by: InterpolateByType = "row",
 ) -> FrameType:
     ps = ParamSchema(
         [
@@ -91,38 +130,191 @@ def impl_handle_null(
 
     df, _params, result_cols = ps.apply("null", df, params)
     grouper_cols = partition.apply(df)
-    # numeric_cols = partition.numerics(df, exclude=ps.names("*", invert=False))
-    value_cols = partition.values(df, exclude=ps.names("*", invert=False))
+    partition_id = partition_id_name(grouper_cols)
+    value_cols = partition.values(
+        df, exclude=ps.names("*", invert=False) + reserved_columns(df)
+    )
+
+    # staleness and time-weighted interpolation are measured along time,
+    # so partitions are then scanned in time order
+    interpolate_by_time = interpolate_by == "time"
+    sort_by = ["time"] if max_staleness is not None or interpolate_by_time else []
 
+    # the kernel walks each partition as a contiguous run of rows
     result = (
-        df.group_by(grouper_cols, maintain_order=True)
-        .map_groups(lambda df: _handle_null_helper(df, value_cols), df.schema)  # type: ignore[call-arg]
-        .select(result_cols)
+        df.pipe(with_partition_id, grouper_cols)
+        .sort(partition_id, *sort_by, maintain_order=True)
+        .with_columns(
+            handle_null_partitioned(
+                pl.col(value_cols),
+                partition_id,
+                "null_strategy",
+                "null_param_1",
+                max_staleness=max_staleness,
+                interpolate_by_time=interpolate_by_time,
+            )
+        )
+        .filter(_handle_null_row_filter(partition_id, value_cols))
+        .select(*[c for c in result_cols if c != partition_id], partition_id)
     )
 
     return result
 
 
 def impl_join(
-    lhs: FrameType, rhs: FrameType, grouper: Grouper, how: JoinStrategy
+    lhs: FrameType,
+    rhs: FrameType,
+    grouper: Grouper,
+    how: SeriesJoinStrategy,
+    asof_strategy: AsofStrategyType = "backward",
+    tolerance: Optional[str] = None,
 ) -> FrameType:
     grouper_cols = grouper.apply(lhs, rhs)
+
+    if how == "asof":
+        return impl_join_asof(lhs, rhs, grouper_cols, asof_strategy, tolerance)
+
     df = lhs.join(rhs, on=grouper_cols, how=how)
 
     return df
 
 
+def impl_join_asof(
+    lhs: FrameType,
+    rhs: FrameType,
+    grouper_cols: List[str],
+    asof_strategy: AsofStrategyType,
+    tolerance: Optional[str],
+) -> FrameType:
+    # sorted merge on time, within each partition of the remaining grouper columns
+    by = [c for c in grouper_cols if c != "time"]
+
+    df = lhs.sort("time").join_asof(
+        rhs.sort("time"),
+        on="time",
+        by=by if len(by) > 0 else None,
+        strategy=asof_strategy,
+        tolerance=tolerance,
+    )
+
+    return df
+
+
+def impl_join_many(
+    lhs: FrameType,
+    others: List[FrameType],
+    grouper: Grouper,
+    how: JoinManyStrategy,
+) -> FrameType:
+    if len(others) == 0:
+        raise ValueError("Bad join_many invocation. No frames to join with")
+
+    # the key columns are resolved once, common to every frame
+    grouper_cols = grouper.apply(lhs, *others)
+
+    result_cols = Grouper.columns(lhs, include_time=True)
+    if how not in ("semi", "anti"):
+        for other in others:
+            other_cols = [
+                c
+                for c in Grouper.columns(other, include_time=True)
+                if c not in grouper_cols
+            ]
+            duplicated_cols = set(result_cols).intersection(other_cols)
+            if len(duplicated_cols) > 0:
+                raise ValueError(
+                    f"Bad join_many invocation. Columns {sorted(duplicated_cols)} appear in more than one frame"
+                )
+            result_cols.extend(other_cols)
+
+    if isinstance(lhs, pl.LazyFrame):
+        others = [other.lazy() for other in others]
+
+    # a convenience wrapper: one pairwise hash join per frame, in the order given.
+    # no size ordering, shared key encoding or k-way merge is done here; callers
+    # joining many large frames should pass the smallest (most selective) first
+    df = lhs
+    for other in others:
+        df = df.join(other, on=grouper_cols, how=how)
+
+    return df.select(result_cols)
+
+
+def impl_join_interval(
+    lhs: FrameType,
+    rhs: FrameType,
+    start: str,
+    end: str,
+    grouper: Grouper,
+    closed: IntervalType,
+) -> FrameType:
+    grouper_cols = grouper.apply(lhs, rhs)
+    by = [c for c in grouper_cols if c != "time"]
+
+    lhs_row_idx = column_name_unique_over("lhs_index", lhs)
+    first_row_idx = column_name_unique_over("first_index", lhs)
+    last_row_idx = column_name_unique_over("last_index", lhs)
+    bound = column_name_unique_over("bound", lhs)
+
+    # lhs ordered by partition then time: the rows of an interval are a contiguous range
+    lhs = (
+        lhs.sort(*by, "time")
+        .with_row_index(lhs_row_idx)
+        .with_columns(pl.col(lhs_row_idx).cast(pl.Int64))
+    )
+    lhs_keys = lhs.select(*by, pl.col("time").alias(bound), lhs_row_idx).sort(bound)
+
+    # sweep both interval bounds through the sorted lhs times, per partition
+    bounds = (
+        rhs.sort(start)
+        .join_asof(
+            lhs_keys.rename({lhs_row_idx: first_row_idx}),
+            left_on=start,
+            right_on=bound,
+            by=by,
+            strategy="forward",
+        )
+        .sort(end)
+        .join_asof(
+            lhs_keys.rename({lhs_row_idx: last_row_idx}),
+            left_on=end,
+            right_on=bound,
+            by=by,
+            strategy="backward",
+        )
+        .filter(pl.col(first_row_idx) <= pl.col(last_row_idx))
+    )
+
+    # expand each interval into the lhs rows it covers
+    matches = bounds.select(
+        pl.exclude(*by, bound, first_row_idx, last_row_idx),
+        pl.int_ranges(pl.col(first_row_idx), pl.col(last_row_idx) + 1).alias(
+            lhs_row_idx
+        ),
+    ).explode(lhs_row_idx)
+
+    df = (
+        lhs.join(matches, on=lhs_row_idx, how="inner")
+        .filter(pl.col("time").is_between(pl.col(start), pl.col(end), closed))
+        .drop(lhs_row_idx)
+    )
+
+    return df
+
+
 def impl_unique(df: FrameType, grouper: Grouper) -> FrameType:
     grouper_cols = grouper.apply(df)
     df = df.unique(subset=grouper_cols, maintain_order=True)
     return df
 
 
-def _add_unique_row_index(df: FrameType) -> FrameType:
-    if RESERVED_ROW_IDX not in df.columns:
-        df = df.with_row_index(name=RESERVED_ROW_IDX)
-
-    return df
+def reserved_columns(df: FrameType) -> List[str]:
+    cols = [
+        c
+        for c in Grouper.columns(df, include_time=True)
+        if c.startswith(RESERVED_COL_PREFIX)
+    ]
+    return cols
 
 
 def column_name_unique_over(name: str, *df: FrameType) -> str:
@@ -145,11 +337,24 @@ def impl_join_on_list_items(
     # right_on column as type: some-dtype
 
     join_key_name = column_name_unique_over("join_key", lhs)
+    item_name = column_name_unique_over("join_item", lhs)
+    rhs_row_idx_name = column_name_unique_over("rhs_index", rhs)
 
     def _make_join_key(xs: pl.Expr) -> pl.Expr:
-        return xs.list.eval(pl.element().to_physical().hash()).list.sort().list.sum()
+        # exact key of the set of items in the list
+        return (
+            xs.list.unique()
+            .list.sort()
+            .list.eval(pl.element().cast(pl.String))
+            .list.join(RESERVED_DELIMITER)
+        )
 
-    result_expr = pl.exclude(left_on.meta.output_name(), right_on.meta.output_name())
+    result_expr = pl.exclude(
+        left_on.meta.output_name(),
+        right_on.meta.output_name(),
+        item_name,
+        rhs_row_idx_name,
+    ).sort_by(rhs_row_idx_name)
 
     if flatten:
         result_expr = result_expr.explode()
@@ -160,24 +365,24 @@ def impl_join_on_list_items(
         if then_sort:
             result_expr = result_expr.sort()
 
-    # build new rhs => construct unique join-keys present in lhs
-    aggregated_rhs = (
-        lhs.pipe(_add_unique_row_index)
-        .select(RESERVED_ROW_IDX, left_on)
-        .join(rhs, how="cross")
-        .filter(right_on.is_in(left_on))
-        .group_by(RESERVED_ROW_IDX)
-        .agg(_make_join_key(left_on.first()).alias(join_key_name), result_expr)
-        .drop(RESERVED_ROW_IDX)
-        .sort(join_key_name)
-        .unique(subset=join_key_name, maintain_order=True)
-    )
+    lhs = lhs.with_columns(_make_join_key(left_on).alias(join_key_name))
 
-    df = (
-        lhs.with_columns(_make_join_key(left_on).alias(join_key_name)).join(
-            aggregated_rhs, on=join_key_name, how=how
+    # build new rhs => one row per distinct set of items present in lhs,
+    # matched item by item with a hash join on the exploded sets
+    aggregated_rhs = (
+        lhs.select(join_key_name, left_on.list.unique().alias(item_name))
+        .unique(subset=join_key_name)
+        .explode(item_name)
+        .join(
+            rhs.with_row_index(rhs_row_idx_name),
+            left_on=item_name,
+            right_on=right_on,
+            how="inner",
         )
-        # .drop(join_key_name)
+        .group_by(join_key_name)
+        .agg(result_expr)
     )
 
+    df = lhs.join(aggregated_rhs, on=join_key_name, how=how)
+
     return df
@@ -1,6 +1,7 @@
 from typing import Generic
 import polars as pl
 
+from .grouper import Grouper
 from .sf import SeriesFrame
 from .types import FrameType
 
@@ -10,7 +11,7 @@ __NAMESPACE = "tsf"
 @pl.api.register_lazyframe_namespace(__NAMESPACE)
 class TimeSeriesFrame(SeriesFrame, Generic[FrameType]):
     def __init__(self, df: FrameType):
-        if "time" not in df.columns:
+        if "time" not in Grouper.columns(df, include_time=True):
             raise ValueError("Missing column: ", "time")
 
         super().__init__(df)
@@ -1,5 +1,6 @@
 from typing import Literal, TypeVar, Union
 import polars as pl
+from polars.type_aliases import JoinStrategy
 
 
 def cast_dtype(expr: pl.Expr, dtype: pl.DataType) -> pl.Expr:
@@ -18,7 +19,19 @@ def cast_dtype(expr: pl.Expr, dtype: pl.DataType) -> pl.Expr:
 FrameType = TypeVar("FrameType", pl.LazyFrame, pl.DataFrame)
 
 RetainValuesType = Literal["lhs", "rhs", "both"]
+SeriesJoinStrategy = Union[JoinStrategy, Literal["asof"]]
+AsofStrategyType = Literal["backward", "forward", "nearest"]
+JoinManyStrategy = Literal["inner", "left", "outer_coalesce", "semi", "anti"]
 IntervalType = Literal["none", "left", "right", "both"]
+InterpolateByType = Literal["row", "time"]
+RollingStatistic = Literal[
+    "sum", "mean", "var", "std", "skew", "min", "max", "median", "quantile", "rank"
+]
+PairwiseStatistic = Literal["corr", "cov", "beta"]
+CumulativeOp = Literal["sum", "prod", "min", "max"]
+DrawdownMethod = Literal["arithmetic", "fractional"]
+PipelineOp = Literal["diff", "shift", "ewm_mean", "cum_sum"]
+CrossSectionOp = Literal["rank", "zscore", "demean", "winsorize"]
 
 CorrelationType = Literal[
     "additive", "multiplicative", "shift", "exponent", "average", "none"
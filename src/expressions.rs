@@ -1,15 +1,23 @@
 #![allow(clippy::unused_unit)]
 use crate::math::{impl_random_normal, impl_random_uniform, impl_wyhash};
+use crate::mathx::{
+    impl_cum_partitioned, impl_diff, impl_diff_partitioned, impl_drawdown_partitioned,
+    impl_ewm_bank_partitioned, impl_ewm_cov_matrix, impl_ewm_mean,
+    impl_ewm_mean_by_time_partitioned, impl_ewm_mean_partitioned, impl_ewm_state_partitioned,
+    impl_limit_change_partitioned, impl_pipeline_partitioned, impl_shift_partitioned, EwmSeed,
+    Stage,
+};
+use crate::null::{impl_handle_null, impl_handle_null_partitioned};
+use crate::rolling::{impl_rolling_pairwise_partitioned, impl_rolling_partitioned, parse_closed};
 // use crate::time::impl_datetime_ranges_custom;
+use crate::time::duration::{time_to_ns, Span};
 use crate::time::utils::temporal_ranges_impl_broadcast;
 use crate::utils::same_output_type;
-use polars_ops::series::{diff, ewm_mean, pct_change, EWMOptions};
 use polars_time::chunkedarray::DateMethods;
 use polars_time::{datetime_range_impl, ClosedWindow, Duration};
 
 use polars_arrow::temporal_conversions::MILLISECONDS_IN_DAY;
 use std::collections::HashSet;
-use std::ops::Add;
 
 use polars::prelude::*;
 
@@ -196,20 +204,10 @@ fn pl_datetime_ranges_custom(inputs: &[Series]) -> PolarsResult<Series> {
 fn pl_ewm_custom(inputs: &[Series]) -> PolarsResult<Series> {
     let s = &inputs[0];
     let alpha = inputs[1].f64()?.get(0).unwrap();
-    let min_periods = inputs[2].u64()?.get(0).unwrap() as usize;
+    let min_periods = inputs[2].u64()?.get(0).unwrap();
     let adjust = inputs[3].bool()?.get(0).unwrap();
 
-    let options = EWMOptions {
-        alpha,
-        adjust,
-        bias: false,
-        min_periods,
-        ignore_nulls: true,
-    };
-
-    // dbg!(&options);
-
-    ewm_mean(s, options)
+    impl_ewm_mean(s, alpha, min_periods, adjust)
 }
 
 #[polars_expr(output_type_func=same_output_type)]
@@ -227,83 +225,325 @@ fn pl_diff_custom(inputs: &[Series]) -> PolarsResult<Series> {
     let n = inputs[1].i64()?.get(0).unwrap();
     let method = inputs[2].str()?.get(0).unwrap();
 
-    match method {
-        "arithmetic" => diff(s, n, polars::series::ops::NullBehavior::Ignore),
-        "fractional" => {
-            let n = Series::new("n__", &[n]);
-            pct_change(s, &n)
-        }
-        "geometric" => {
-            let n = Series::new("n__", &[n]);
-            let res = pct_change(s, &n).unwrap().add(1_f64);
-            Ok(res)
-        }
-        _ => {
-            panic!("unknown diff method `{:?}`", method)
-        }
+    impl_diff(s, n, method)
+}
+
+/// States to resume from, when given as the `weight`, `mean` and `count`
+/// inputs following `offset`.
+fn ewm_seed(inputs: &[Series], offset: usize) -> PolarsResult<EwmSeed> {
+    if inputs.len() < offset + 3 {
+        return Ok(EwmSeed::default());
     }
+
+    Ok(EwmSeed {
+        weight: inputs[offset].f64()?.into_iter().collect(),
+        mean: inputs[offset + 1].f64()?.into_iter().collect(),
+        count: inputs[offset + 2].u64()?.into_iter().collect(),
+    })
 }
 
 #[polars_expr(output_type_func=same_output_type)]
-fn pl_handle_null_custom(inputs: &[Series]) -> PolarsResult<Series> {
+fn pl_ewm_partitioned(inputs: &[Series]) -> PolarsResult<Series> {
     let values = &inputs[0];
-    let null_strategy = inputs[1].str()?.get(0).unwrap();
+    let partition_id = &inputs[1];
+    let alpha = inputs[2].f64()?;
+    let min_periods = inputs[3].u64()?;
+    let adjust = inputs[4].bool()?;
+    let seed = ewm_seed(inputs, 5)?;
 
-    // dbg!(&null_strategy);
-    // dbg!(&arg_1);
-    // dbg!(&values);
+    impl_ewm_mean_partitioned(values, partition_id, alpha, min_periods, adjust, &seed)
+}
 
-    let mut result = values.clone();
-    match null_strategy {
-        "sentinel" => {
-            let sentinel = inputs[2].f64()?.get(0).unwrap();
-            result = result.f64()?.fill_null_with_values(sentinel)?.into_series();
-        }
-        "trim_start_n" => {
-            let input_len = &values.len();
-            let n = inputs[2].cast(&DataType::Int64)?.i64()?.get(0).unwrap();
-            let result_len = input_len - (n as usize);
-            result = result.slice(n, result_len);
-        }
-        "trim_end_n" => {
-            let input_len = &values.len();
-            let n = inputs[2].cast(&DataType::Int64)?.i64()?.get(0).unwrap();
-            let result_len = input_len - (n as usize);
-            result = result.slice(0, result_len);
-        }
-        "drop" => {
-            result = result.drop_nulls();
-        }
-        "forward" => {
-            result = result.fill_null(FillNullStrategy::Forward(None))?;
-        }
-        "backward" => {
-            result = result.fill_null(FillNullStrategy::Backward(None))?;
-        }
-        "interpolate_linear" => {
-            dbg!("todo interpolate_linear");
-        }
-        "interpolate_nearest" => {
-            dbg!("todo interpolate_nearest");
-        }
-        "min" => {
-            result = result.fill_null(FillNullStrategy::Min)?;
-        }
-        "max" => {
-            result = result.fill_null(FillNullStrategy::Max)?;
-        }
-        "mean" => {
-            result = result.fill_null(FillNullStrategy::Mean)?;
-        }
-        "ignore" => {
-            result = values.clone();
-        }
-        _ => {
-            panic!("unknown null_strategy: `{:?}`", null_strategy)
-        }
+#[polars_expr(output_type_func=same_output_type)]
+fn pl_ewm_by_time_partitioned(inputs: &[Series]) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let time = time_to_ns(&inputs[2])?;
+    let alpha = inputs[3].f64()?;
+    let half_life = inputs[4].str()?;
+    let min_periods = inputs[5].u64()?;
+    let adjust = inputs[6].bool()?;
+
+    impl_ewm_mean_by_time_partitioned(
+        values,
+        partition_id,
+        &time,
+        alpha,
+        half_life,
+        min_periods,
+        adjust,
+    )
+}
+
+#[derive(Deserialize)]
+struct PipelineKwargs {
+    stages: Vec<Stage>,
+}
+
+#[polars_expr(output_type=Float64)]
+fn pl_pipeline_partitioned(inputs: &[Series], kwargs: PipelineKwargs) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+
+    impl_pipeline_partitioned(values, partition_id, &kwargs.stages)
+}
+
+fn list_f64_dtype(input_fields: &[Field]) -> PolarsResult<Field> {
+    let dtype = DataType::List(Box::new(DataType::Float64));
+    Ok(Field::new(input_fields[0].name(), dtype))
+}
+
+#[derive(Deserialize)]
+struct EwmBankKwargs {
+    alphas: Vec<f64>,
+}
+
+#[polars_expr(output_type_func=list_f64_dtype)]
+fn pl_ewm_bank_partitioned(inputs: &[Series], kwargs: EwmBankKwargs) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let min_periods = inputs[2].u64()?;
+    let adjust = inputs[3].bool()?;
+
+    impl_ewm_bank_partitioned(values, partition_id, &kwargs.alphas, min_periods, adjust)
+}
+
+fn ewm_state_dtype(input_fields: &[Field]) -> PolarsResult<Field> {
+    let dtype = DataType::Struct(vec![
+        Field::new("weight", DataType::Float64),
+        Field::new("mean", DataType::Float64),
+        Field::new("count", DataType::UInt64),
+    ]);
+    Ok(Field::new(input_fields[0].name(), dtype))
+}
+
+#[polars_expr(output_type_func=ewm_state_dtype)]
+fn pl_ewm_state_partitioned(inputs: &[Series]) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let alpha = inputs[2].f64()?;
+    let adjust = inputs[3].bool()?;
+    let seed = ewm_seed(inputs, 4)?;
+
+    impl_ewm_state_partitioned(values, partition_id, alpha, adjust, &seed)
+}
+
+#[polars_expr(output_type_func=same_output_type)]
+fn pl_shift_partitioned(inputs: &[Series]) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let n = inputs[2].i64()?;
+
+    impl_shift_partitioned(values, partition_id, n)
+}
+
+#[polars_expr(output_type_func=same_output_type)]
+fn pl_diff_partitioned(inputs: &[Series]) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let n = inputs[2].i64()?;
+    let method = inputs[3].str()?;
+
+    impl_diff_partitioned(values, partition_id, n, method)
+}
+
+#[polars_expr(output_type=Float64)]
+fn pl_limit_change_partitioned(inputs: &[Series]) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let max_change = inputs[2].f64()?;
+    let method = inputs[3].str()?;
+
+    impl_limit_change_partitioned(values, partition_id, max_change, method)
+}
+
+fn drawdown_dtype(input_fields: &[Field]) -> PolarsResult<Field> {
+    let dtype = DataType::Struct(vec![
+        Field::new("peak", DataType::Float64),
+        Field::new("drawdown", DataType::Float64),
+        Field::new("duration", DataType::UInt32),
+    ]);
+    Ok(Field::new(input_fields[0].name(), dtype))
+}
+
+#[derive(Deserialize)]
+struct CumKwargs {
+    op: String,
+}
+
+#[polars_expr(output_type_func=same_output_type)]
+fn pl_cum_partitioned(inputs: &[Series], kwargs: CumKwargs) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let reset = &inputs[2];
+
+    impl_cum_partitioned(values, partition_id, reset, &kwargs.op)
+}
+
+#[derive(Deserialize)]
+struct DrawdownKwargs {
+    method: String,
+}
+
+#[polars_expr(output_type_func=drawdown_dtype)]
+fn pl_drawdown_partitioned(inputs: &[Series], kwargs: DrawdownKwargs) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+
+    impl_drawdown_partitioned(values, partition_id, &kwargs.method)
+}
+
+#[derive(Deserialize)]
+struct EwmCovKwargs {
+    correlation: bool,
+}
+
+#[polars_expr(output_type=Float64)]
+fn pl_ewm_cov_matrix(inputs: &[Series], kwargs: EwmCovKwargs) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let series_id = &inputs[1];
+    let time = time_to_ns(&inputs[2])?;
+    let alpha = inputs[3].f64()?;
+    let min_periods = inputs[4].u64()?;
+    let adjust = inputs[5].bool()?;
+
+    // the matrix is shared by all series, and so are its parameters
+    if alpha.len() != 1 || min_periods.len() != 1 || adjust.len() != 1 {
+        return Err(PolarsError::ComputeError(
+            "ewm covariance expects a single alpha, min_periods and adjust for all series".into(),
+        ));
     }
 
-    Ok(result)
+    impl_ewm_cov_matrix(
+        values,
+        series_id,
+        &time,
+        alpha.get(0).unwrap_or(0.5),
+        min_periods.get(0).unwrap_or(0) as usize,
+        adjust.get(0).unwrap_or(false),
+        kwargs.correlation,
+    )
+}
+
+#[derive(Deserialize)]
+struct RollingKwargs {
+    statistic: String,
+    closed: String,
+}
+
+#[polars_expr(output_type=Float64)]
+fn pl_rolling_partitioned(inputs: &[Series], kwargs: RollingKwargs) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let window = inputs[2].i64()?;
+    let min_periods = inputs[3].i64()?;
+    let quantile = inputs[4].f64()?;
+    let period = inputs[5].str()?;
+    let time = match inputs.get(6) {
+        Some(time) => Some(time_to_ns(time)?),
+        None => None,
+    };
+
+    impl_rolling_partitioned(
+        values,
+        partition_id,
+        window,
+        min_periods,
+        quantile,
+        period,
+        time.as_ref(),
+        &kwargs.statistic,
+        parse_closed(&kwargs.closed)?,
+    )
+}
+
+#[polars_expr(output_type=Float64)]
+fn pl_rolling_pairwise_partitioned(
+    inputs: &[Series],
+    kwargs: RollingKwargs,
+) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let other = &inputs[1];
+    let partition_id = &inputs[2];
+    let window = inputs[3].i64()?;
+    let min_periods = inputs[4].i64()?;
+    let period = inputs[5].str()?;
+    let time = match inputs.get(6) {
+        Some(time) => Some(time_to_ns(time)?),
+        None => None,
+    };
+
+    impl_rolling_pairwise_partitioned(
+        values,
+        other,
+        partition_id,
+        window,
+        min_periods,
+        period,
+        time.as_ref(),
+        &kwargs.statistic,
+        parse_closed(&kwargs.closed)?,
+    )
+}
+
+// Entry point of the public `expr.sf.handle_null_custom` expression, over a single
+// series. The namespace methods use `pl_handle_null_partitioned` below.
+#[polars_expr(output_type_func=same_output_type)]
+fn pl_handle_null_custom(inputs: &[Series]) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let null_strategy = inputs[1].str()?.get(0).unwrap_or("ignore");
+    let null_param_1 = inputs[2].cast(&DataType::Float64)?.f64()?.get(0);
+
+    impl_handle_null(values, null_strategy, null_param_1, None, None, false)
+}
+
+#[derive(Deserialize)]
+struct HandleNullKwargs {
+    max_staleness: Option<String>,
+    interpolate_by_time: bool,
+}
+
+#[polars_expr(output_type_func=same_output_type)]
+fn pl_handle_null_partitioned(inputs: &[Series], kwargs: HandleNullKwargs) -> PolarsResult<Series> {
+    let values = &inputs[0];
+    let partition_id = &inputs[1];
+    let null_strategy = inputs[2].rechunk();
+    let null_param_1 = inputs[3].cast(&DataType::Float64)?.rechunk();
+
+    let max_staleness = match kwargs.max_staleness {
+        Some(span) => Some(Span::parse(&span)?),
+        None => None,
+    };
+    let time = match inputs.get(4) {
+        Some(time) => Some(time_to_ns(time)?),
+        None => None,
+    };
+
+    impl_handle_null_partitioned(
+        values,
+        partition_id,
+        null_strategy.str()?,
+        null_param_1.f64()?,
+        time.as_ref(),
+        max_staleness,
+        kwargs.interpolate_by_time,
+    )
+}
+
+#[derive(Deserialize)]
+struct AssertSingleRowKwargs {
+    message: String,
+}
+
+/// Pass the column through unchanged, failing the query when it holds more than
+/// one row. Lets a row-count check run inside a lazy plan instead of collecting it.
+#[polars_expr(output_type_func=same_output_type)]
+fn pl_assert_single_row(inputs: &[Series], kwargs: AssertSingleRowKwargs) -> PolarsResult<Series> {
+    let s = &inputs[0];
+    if s.len() > 1 {
+        return Err(PolarsError::ComputeError(kwargs.message.into()));
+    }
+    Ok(s.clone())
 }
 
 #[cfg(test)]
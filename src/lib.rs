@@ -1,5 +1,8 @@
 mod expressions;
 mod math;
+mod mathx;
+mod null;
+mod rolling;
 mod time;
 mod utils;
 
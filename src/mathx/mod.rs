@@ -0,0 +1,703 @@
+#![allow(clippy::unused_unit)]
+use polars::prelude::*;
+use polars_ops::series::{diff, pct_change};
+use std::ops::Add;
+
+mod pipeline;
+
+use crate::time::duration::Span;
+use crate::utils::{apply_partitioned, apply_partitioned_f64, param_at, partition_slices};
+
+pub(crate) use pipeline::{impl_pipeline_partitioned, Stage};
+
+// The kernels below walk `values` sorted by partition in a single pass,
+// reading the parameters of each partition from compact per-partition arrays.
+
+/// Running state of an exponentially weighted mean, updated as `polars_ops::ewm_mean`
+/// with `ignore_nulls`: the weight of the past observations, their weighted mean
+/// and the number of observations. Carrying it over from the end of one frame to
+/// the start of the next gives the same result as a single pass over both.
+#[derive(Clone, Copy)]
+pub(crate) struct EwmState {
+    weight: f64,
+    mean: Option<f64>,
+    count: u64,
+}
+
+impl EwmState {
+    fn new() -> Self {
+        EwmState {
+            weight: 1.0,
+            mean: None,
+            count: 0,
+        }
+    }
+
+    fn update(&mut self, x: Option<f64>, alpha: f64, adjust: bool) {
+        let x = match x {
+            Some(x) => x,
+            None => return,
+        };
+
+        self.count += 1;
+        match self.mean {
+            None => self.mean = Some(x),
+            Some(mean) => {
+                let new_wt = if adjust { 1.0 } else { alpha };
+                self.weight *= 1.0 - alpha;
+                if mean != x {
+                    self.mean = Some((self.weight * mean + new_wt * x) / (self.weight + new_wt));
+                }
+                self.weight = if adjust { self.weight + new_wt } else { 1.0 };
+            }
+        }
+    }
+
+    fn value(&self, min_periods: u64) -> Option<f64> {
+        if self.count < min_periods {
+            None
+        } else {
+            self.mean
+        }
+    }
+}
+
+/// States of each partition to resume from, as compact per-partition arrays.
+/// A partition without a state starts afresh.
+#[derive(Default)]
+pub(crate) struct EwmSeed {
+    pub(crate) weight: Vec<Option<f64>>,
+    pub(crate) mean: Vec<Option<f64>>,
+    pub(crate) count: Vec<Option<u64>>,
+}
+
+impl EwmSeed {
+    fn at(&self, partition: usize) -> EwmState {
+        match param_at(&self.weight, "weight", partition) {
+            Ok(weight) => EwmState {
+                weight,
+                mean: param_at(&self.mean, "mean", partition).ok(),
+                count: param_at(&self.count, "count", partition).unwrap_or(0),
+            },
+            Err(_) => EwmState::new(),
+        }
+    }
+}
+
+/// Exponentially weighted mean of `x`, resuming from `state`, written to `out`.
+fn ewm_mean_into(
+    x: &[Option<f64>],
+    alpha: f64,
+    min_periods: u64,
+    adjust: bool,
+    mut state: EwmState,
+    out: &mut [Option<f64>],
+) {
+    for (x, out) in x.iter().zip(out.iter_mut()) {
+        state.update(*x, alpha, adjust);
+        *out = state.value(min_periods);
+    }
+}
+
+/// Like ewm_mean, a Float32 input gives a Float32 result.
+fn ewm_output_type(result: Series, values: &Series) -> PolarsResult<Series> {
+    match values.dtype() {
+        DataType::Float32 => result.cast(&DataType::Float32),
+        _ => Ok(result),
+    }
+}
+
+/// Exponentially weighted mean of `values`, resuming from `state`.
+fn ewm_mean_from(
+    values: &Series,
+    alpha: f64,
+    min_periods: u64,
+    adjust: bool,
+    state: EwmState,
+) -> PolarsResult<Series> {
+    let x = values.cast(&DataType::Float64)?;
+    let x: Vec<Option<f64>> = x.f64()?.into_iter().collect();
+    let mut result: Vec<Option<f64>> = vec![None; x.len()];
+    ewm_mean_into(&x, alpha, min_periods, adjust, state, &mut result);
+
+    let result = Float64Chunked::from_slice_options(values.name(), &result).into_series();
+    ewm_output_type(result, values)
+}
+
+pub(crate) fn impl_ewm_mean(
+    values: &Series,
+    alpha: f64,
+    min_periods: u64,
+    adjust: bool,
+) -> PolarsResult<Series> {
+    ewm_mean_from(values, alpha, min_periods, adjust, EwmState::new())
+}
+
+pub(crate) fn impl_ewm_mean_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    alpha: &Float64Chunked,
+    min_periods: &UInt64Chunked,
+    adjust: &BooleanChunked,
+    seed: &EwmSeed,
+) -> PolarsResult<Series> {
+    let alpha: Vec<Option<f64>> = alpha.into_iter().collect();
+    let min_periods: Vec<Option<u64>> = min_periods.into_iter().collect();
+    let adjust: Vec<Option<bool>> = adjust.into_iter().collect();
+
+    let result = apply_partitioned_f64(values, partition_id, |x, partition, _offset, out| {
+        ewm_mean_into(
+            x,
+            param_at(&alpha, "alpha", partition)?,
+            param_at(&min_periods, "min_periods", partition)?,
+            param_at(&adjust, "adjust", partition)?,
+            seed.at(partition),
+            out,
+        );
+        Ok(())
+    })?;
+    ewm_output_type(result, values)
+}
+
+/// Exponentially weighted mean of `values` decaying with the `time` elapsed since
+/// the previous observation of the partition: an observation one `half_life` older
+/// weighs half as much. A partition without a `half_life` decays by `alpha` per row.
+#[allow(clippy::too_many_arguments)]
+pub(crate) fn impl_ewm_mean_by_time_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    time: &Int64Chunked,
+    alpha: &Float64Chunked,
+    half_life: &StringChunked,
+    min_periods: &UInt64Chunked,
+    adjust: &BooleanChunked,
+) -> PolarsResult<Series> {
+    let alpha: Vec<Option<f64>> = alpha.into_iter().collect();
+    let half_life: Vec<Option<&str>> = half_life.into_iter().collect();
+    let min_periods: Vec<Option<u64>> = min_periods.into_iter().collect();
+    let adjust: Vec<Option<bool>> = adjust.into_iter().collect();
+
+    let result = apply_partitioned_f64(values, partition_id, |x, partition, offset, out| {
+        let min_periods = param_at(&min_periods, "min_periods", partition)?;
+        let adjust = param_at(&adjust, "adjust", partition)?;
+        let half_life = match param_at(&half_life, "half_life", partition) {
+            Ok(half_life) => Span::parse(half_life)?,
+            Err(_) => {
+                let alpha = param_at(&alpha, "alpha", partition)?;
+                ewm_mean_into(x, alpha, min_periods, adjust, EwmState::new(), out);
+                return Ok(());
+            }
+        };
+        if half_life.length() <= 0 {
+            return Err(PolarsError::ComputeError(
+                "ewm half_life must be positive".into(),
+            ));
+        }
+
+        let mut state = EwmState::new();
+        let mut last_time: Option<i64> = None;
+
+        let time = time.slice(offset, x.len());
+        for ((&x, t), out) in x.iter().zip(time.into_iter()).zip(out.iter_mut()) {
+            let t = t.ok_or_else(|| {
+                PolarsError::ComputeError("ewm over time requires a non-null time".into())
+            })?;
+            // the decay only counts the time elapsed since the last observation
+            let alpha = match (x, last_time) {
+                (Some(_), Some(last_time)) => {
+                    let steps = half_life.distance(last_time, t) as f64 / half_life.length() as f64;
+                    1.0 - 0.5_f64.powf(steps)
+                }
+                _ => 1.0,
+            };
+            if x.is_some() {
+                last_time = Some(t);
+            }
+            state.update(x, alpha, adjust);
+            *out = state.value(min_periods);
+        }
+        Ok(())
+    })?;
+    ewm_output_type(result, values)
+}
+
+/// Exponentially weighted means of `values` for each of `alphas`, updated together
+/// as each value is read: one list of `alphas.len()` means per row.
+pub(crate) fn impl_ewm_bank_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    alphas: &[f64],
+    min_periods: &UInt64Chunked,
+    adjust: &BooleanChunked,
+) -> PolarsResult<Series> {
+    let min_periods: Vec<Option<u64>> = min_periods.into_iter().collect();
+    let adjust: Vec<Option<bool>> = adjust.into_iter().collect();
+
+    // a single list builder, sized to the frame, is shared by all partitions
+    let mut builder = ListPrimitiveChunkedBuilder::<Float64Type>::new(
+        values.name(),
+        values.len(),
+        values.len() * alphas.len(),
+        DataType::Float64,
+    );
+    let mut means: Vec<Option<f64>> = Vec::with_capacity(alphas.len());
+
+    let x = values.cast(&DataType::Float64)?;
+    let x: Vec<Option<f64>> = x.f64()?.into_iter().collect();
+    for (partition, (offset, len)) in partition_slices(partition_id)?.into_iter().enumerate() {
+        let min_periods = param_at(&min_periods, "min_periods", partition)?;
+        let adjust = param_at(&adjust, "adjust", partition)?;
+        let mut states = vec![EwmState::new(); alphas.len()];
+
+        for &x in x[offset as usize..offset as usize + len].iter() {
+            means.clear();
+            means.extend(states.iter_mut().zip(alphas).map(|(state, &alpha)| {
+                state.update(x, alpha, adjust);
+                state.value(min_periods)
+            }));
+            builder.append_iter(means.iter().copied());
+        }
+    }
+
+    Ok(builder.finish().into_series())
+}
+
+/// State of each partition after its last row, one row per partition, as a
+/// struct of `weight`, `mean` and `count`.
+pub(crate) fn impl_ewm_state_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    alpha: &Float64Chunked,
+    adjust: &BooleanChunked,
+    seed: &EwmSeed,
+) -> PolarsResult<Series> {
+    let alpha: Vec<Option<f64>> = alpha.into_iter().collect();
+    let adjust: Vec<Option<bool>> = adjust.into_iter().collect();
+
+    let partitions = partition_slices(partition_id)?;
+    let mut weights: Vec<f64> = Vec::with_capacity(partitions.len());
+    let mut means: Vec<Option<f64>> = Vec::with_capacity(partitions.len());
+    let mut counts: Vec<u64> = Vec::with_capacity(partitions.len());
+
+    let x = values.cast(&DataType::Float64)?;
+    let x: Vec<Option<f64>> = x.f64()?.into_iter().collect();
+    for (partition, (offset, len)) in partitions.into_iter().enumerate() {
+        let alpha = param_at(&alpha, "alpha", partition)?;
+        let adjust = param_at(&adjust, "adjust", partition)?;
+        let mut state = seed.at(partition);
+
+        x[offset as usize..offset as usize + len]
+            .iter()
+            .for_each(|&x| state.update(x, alpha, adjust));
+
+        weights.push(state.weight);
+        means.push(state.mean);
+        counts.push(state.count);
+    }
+
+    let fields = [
+        Series::new("weight", &weights),
+        Series::new("mean", &means),
+        Series::new("count", &counts),
+    ];
+    Ok(StructChunked::new(values.name(), &fields)?.into_series())
+}
+
+pub(crate) fn impl_shift_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    n: &Int64Chunked,
+) -> PolarsResult<Series> {
+    let n: Vec<Option<i64>> = n.into_iter().collect();
+
+    // every partition is shifted within its own rows by a single gather
+    let mut take_idx: Vec<Option<IdxSize>> = vec![None; values.len()];
+    for (partition, (offset, len)) in partition_slices(partition_id)?.into_iter().enumerate() {
+        let n = param_at(&n, "n", partition)?;
+        let offset = offset as usize;
+        for (idx, take) in take_idx[offset..offset + len].iter_mut().enumerate() {
+            let source = idx as i64 - n;
+            if source >= 0 && source < len as i64 {
+                *take = Some((offset + source as usize) as IdxSize);
+            }
+        }
+    }
+
+    values.take(&IdxCa::from_slice_options(values.name(), &take_idx))
+}
+
+pub(crate) fn impl_diff(values: &Series, n: i64, method: &str) -> PolarsResult<Series> {
+    match method {
+        "arithmetic" => diff(values, n, polars::series::ops::NullBehavior::Ignore),
+        "fractional" => {
+            let n = Series::new("n__", &[n]);
+            pct_change(values, &n)
+        }
+        "geometric" => {
+            let n = Series::new("n__", &[n]);
+            let res = pct_change(values, &n)?.add(1_f64);
+            Ok(res)
+        }
+        _ => Err(PolarsError::ComputeError(
+            format!("unknown diff method `{}`", method).into(),
+        )),
+    }
+}
+
+pub(crate) fn impl_diff_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    n: &Int64Chunked,
+    method: &StringChunked,
+) -> PolarsResult<Series> {
+    let n: Vec<Option<i64>> = n.into_iter().collect();
+    let method: Vec<Option<&str>> = method.into_iter().collect();
+
+    apply_partitioned(values, partition_id, |values, partition, _offset| {
+        impl_diff(
+            values,
+            param_at(&n, "n", partition)?,
+            param_at(&method, "method", partition)?,
+        )
+    })
+}
+
+/// Exponentially weighted moments of a pair of series, over the times both are
+/// observed. Follows the bias-corrected recursion used by `ewm_var`.
+#[derive(Clone, Default)]
+struct EwmPair {
+    nobs: usize,
+    mean_x: f64,
+    mean_y: f64,
+    cov: f64,
+    var_x: f64,
+    var_y: f64,
+    sum_wt: f64,
+    sum_wt2: f64,
+    old_wt: f64,
+}
+
+impl EwmPair {
+    fn update(&mut self, x: f64, y: f64, alpha: f64, adjust: bool) {
+        if self.nobs == 0 {
+            *self = EwmPair {
+                nobs: 1,
+                mean_x: x,
+                mean_y: y,
+                sum_wt: 1.0,
+                sum_wt2: 1.0,
+                old_wt: 1.0,
+                ..Default::default()
+            };
+            return;
+        }
+
+        let new_wt = if adjust { 1.0 } else { alpha };
+        let decay = 1.0 - alpha;
+        self.sum_wt *= decay;
+        self.sum_wt2 *= decay * decay;
+        self.old_wt *= decay;
+
+        let (mean_x, mean_y) = (self.mean_x, self.mean_y);
+        let total_wt = self.old_wt + new_wt;
+        self.mean_x = (self.old_wt * mean_x + new_wt * x) / total_wt;
+        self.mean_y = (self.old_wt * mean_y + new_wt * y) / total_wt;
+
+        let (dx, dy) = (mean_x - self.mean_x, mean_y - self.mean_y);
+        let (ex, ey) = (x - self.mean_x, y - self.mean_y);
+        self.cov = (self.old_wt * (self.cov + dx * dy) + new_wt * ex * ey) / total_wt;
+        self.var_x = (self.old_wt * (self.var_x + dx * dx) + new_wt * ex * ex) / total_wt;
+        self.var_y = (self.old_wt * (self.var_y + dy * dy) + new_wt * ey * ey) / total_wt;
+
+        self.sum_wt += new_wt;
+        self.sum_wt2 += new_wt * new_wt;
+        self.old_wt += new_wt;
+        if !adjust {
+            self.sum_wt /= self.old_wt;
+            self.sum_wt2 /= self.old_wt * self.old_wt;
+            self.old_wt = 1.0;
+        }
+        self.nobs += 1;
+    }
+
+    fn value(&self, min_periods: usize, correlation: bool) -> Option<f64> {
+        if self.nobs < min_periods.max(1) {
+            return None;
+        }
+
+        if correlation {
+            let denominator = (self.var_x * self.var_y).sqrt();
+            return (denominator > 0.0).then(|| (self.cov / denominator).clamp(-1.0, 1.0));
+        }
+
+        let numerator = self.sum_wt * self.sum_wt;
+        let denominator = numerator - self.sum_wt2;
+        let debias = if denominator > 0.0 {
+            numerator / denominator
+        } else {
+            1.0
+        };
+        Some(debias * self.cov)
+    }
+}
+
+/// Exponentially weighted covariance (or correlation) matrix of the series
+/// identified by `series_id` (dense, from 0), after each distinct `time`.
+/// Rows are expected sorted by time. The matrix is held as its upper triangle
+/// and only the pairs observed at a time are updated; every matrix is then
+/// emitted in full, time by time, row-major.
+pub(crate) fn impl_ewm_cov_matrix(
+    values: &Series,
+    series_id: &Series,
+    time: &Int64Chunked,
+    alpha: f64,
+    min_periods: usize,
+    adjust: bool,
+    correlation: bool,
+) -> PolarsResult<Series> {
+    if !(alpha > 0.0 && alpha <= 1.0) {
+        return Err(PolarsError::ComputeError(
+            format!("ewm alpha must be in (0, 1], got {}", alpha).into(),
+        ));
+    }
+
+    let values = values.cast(&DataType::Float64)?;
+    let values = values.f64()?;
+    let series_id = series_id.cast(&DataType::UInt32)?;
+    let series_id = series_id.u32()?;
+    let n = series_id.max().map_or(0, |n| n as usize + 1);
+
+    let upper = |i: usize, j: usize| {
+        let (i, j) = if i <= j { (i, j) } else { (j, i) };
+        i * n - i * (i + 1) / 2 + j
+    };
+    let mut pairs = vec![EwmPair::default(); n * (n + 1) / 2];
+    let mut observed: Vec<Option<f64>> = vec![None; n];
+    let mut result: Vec<Option<f64>> = Vec::new();
+
+    let rows: Vec<(Option<i64>, Option<u32>, Option<f64>)> = time
+        .into_iter()
+        .zip(series_id.into_iter())
+        .zip(values.into_iter())
+        .map(|((t, id), x)| (t, id, x))
+        .collect();
+
+    let mut start = 0;
+    while start < rows.len() {
+        let t = rows[start].0;
+        let mut end = start;
+        while end < rows.len() && rows[end].0 == t {
+            if let (Some(id), Some(x)) = (rows[end].1, rows[end].2) {
+                observed[id as usize] = Some(x);
+            }
+            end += 1;
+        }
+
+        let present: Vec<(usize, f64)> = observed
+            .iter()
+            .enumerate()
+            .filter_map(|(i, x)| x.map(|x| (i, x)))
+            .collect();
+        for (a, &(i, x)) in present.iter().enumerate() {
+            for &(j, y) in present[a..].iter() {
+                pairs[upper(i, j)].update(x, y, alpha, adjust);
+            }
+        }
+        observed.iter_mut().for_each(|x| *x = None);
+
+        result.reserve(n * n);
+        for i in 0..n {
+            for j in 0..n {
+                result.push(pairs[upper(i, j)].value(min_periods, correlation));
+            }
+        }
+
+        start = end;
+    }
+
+    Ok(Float64Chunked::from_slice_options(values.name(), &result).into_series())
+}
+
+/// Rows of `values` that start a new segment: where a boolean `reset` is true or,
+/// for any other dtype, where `reset` differs from the previous row.
+fn segment_starts(reset: &Series) -> PolarsResult<Vec<bool>> {
+    let starts = match reset.dtype() {
+        DataType::Boolean => reset.bool()?.clone(),
+        _ => reset.not_equal_missing(&reset.shift(1))?,
+    };
+
+    Ok(starts.into_iter().map(|s| s.unwrap_or(false)).collect())
+}
+
+/// Cumulative `op` ("sum", "prod", "min" or "max") of each partition, restarted at
+/// the start of every segment marked by `reset`. Like the cumulative methods,
+/// nulls stay null and are skipped by the running value.
+pub(crate) fn impl_cum_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    reset: &Series,
+    op: &str,
+) -> PolarsResult<Series> {
+    let combine: fn(f64, f64) -> f64 = match op {
+        "sum" => |acc, x| acc + x,
+        "prod" => |acc, x| acc * x,
+        "min" => f64::min,
+        "max" => f64::max,
+        _ => {
+            return Err(PolarsError::ComputeError(
+                format!("unknown cumulative op `{}`", op).into(),
+            ))
+        }
+    };
+
+    // a partition restarts the running value anyway, so the segment starts can be
+    // found over the whole frame at once
+    let starts = segment_starts(reset)?;
+
+    let result = apply_partitioned_f64(values, partition_id, |x, _partition, offset, out| {
+        let starts = &starts[offset as usize..offset as usize + x.len()];
+
+        let mut acc: Option<f64> = None;
+        for ((&x, &start), out) in x.iter().zip(starts).zip(out.iter_mut()) {
+            if start {
+                acc = None;
+            }
+            *out = x.map(|x| {
+                let value = acc.map_or(x, |acc| combine(acc, x));
+                acc = Some(value);
+                value
+            });
+        }
+        Ok(())
+    })?;
+
+    result.cast(values.dtype())
+}
+
+/// Running peak of each partition, the drawdown from it and the number of rows
+/// since it was set, as the fields of a struct. The drawdown is `x - peak`
+/// ("arithmetic") or `x / peak - 1` ("fractional", null unless the peak is
+/// positive). Nulls are skipped.
+pub(crate) fn impl_drawdown_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    method: &str,
+) -> PolarsResult<Series> {
+    let fractional = match method {
+        "arithmetic" => false,
+        "fractional" => true,
+        _ => {
+            return Err(PolarsError::ComputeError(
+                format!("unknown drawdown method `{}`", method).into(),
+            ))
+        }
+    };
+
+    let x = values.cast(&DataType::Float64)?;
+    let x: Vec<Option<f64>> = x.f64()?.into_iter().collect();
+
+    // the fields are filled partition after partition, each sized to the frame
+    let mut peaks: Vec<Option<f64>> = Vec::with_capacity(x.len());
+    let mut drawdowns: Vec<Option<f64>> = Vec::with_capacity(x.len());
+    let mut durations: Vec<Option<u32>> = Vec::with_capacity(x.len());
+
+    for (offset, len) in partition_slices(partition_id)? {
+        let mut peak: Option<f64> = None;
+        let mut since_peak: u32 = 0;
+
+        for &x in x[offset as usize..offset as usize + len].iter() {
+            match (x, peak) {
+                (None, _) => {
+                    peaks.push(None);
+                    drawdowns.push(None);
+                    durations.push(None);
+                    continue;
+                }
+                (Some(x), Some(p)) if x < p => since_peak += 1,
+                (Some(x), _) => {
+                    peak = Some(x);
+                    since_peak = 0;
+                }
+            }
+
+            let (x, p) = (x.unwrap_or_default(), peak.unwrap_or_default());
+            peaks.push(Some(p));
+            // a fractional drawdown is only defined from a positive peak
+            drawdowns.push(match fractional {
+                true if p > 0.0 => Some(x / p - 1.0),
+                true => None,
+                false => Some(x - p),
+            });
+            durations.push(Some(since_peak));
+        }
+    }
+
+    let fields = [
+        Float64Chunked::from_slice_options("peak", &peaks).into_series(),
+        Float64Chunked::from_slice_options("drawdown", &drawdowns).into_series(),
+        UInt32Chunked::from_slice_options("duration", &durations).into_series(),
+    ];
+    Ok(StructChunked::new(values.name(), &fields)?.into_series())
+}
+
+/// Follow `x` into `out`, but move each step by at most `max_change` from the
+/// previous result ("arithmetic") or by at most a fraction `max_change` of it
+/// ("fractional"). Nulls are skipped.
+fn limit_change(x: &[Option<f64>], max_change: f64, fractional: bool, out: &mut [Option<f64>]) {
+    let mut previous: Option<f64> = None;
+
+    for (&x, out) in x.iter().zip(out.iter_mut()) {
+        let x = match x {
+            Some(x) => x,
+            None => continue,
+        };
+        let y = match previous {
+            Some(p) => {
+                let limit = if fractional {
+                    (max_change * p).abs()
+                } else {
+                    max_change
+                };
+                p + (x - p).clamp(-limit, limit)
+            }
+            None => x,
+        };
+        previous = Some(y);
+        *out = Some(y);
+    }
+}
+
+pub(crate) fn impl_limit_change_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    max_change: &Float64Chunked,
+    method: &StringChunked,
+) -> PolarsResult<Series> {
+    let max_change: Vec<Option<f64>> = max_change.into_iter().collect();
+    let method: Vec<Option<&str>> = method.into_iter().collect();
+
+    apply_partitioned_f64(values, partition_id, |x, partition, _offset, out| {
+        let max_change = param_at(&max_change, "max_change", partition)?;
+        if !(max_change >= 0.0) {
+            return Err(PolarsError::ComputeError(
+                format!(
+                    "limit_change expects a non-negative max_change, got {}",
+                    max_change
+                )
+                .into(),
+            ));
+        }
+        let fractional = match param_at(&method, "method", partition)? {
+            "arithmetic" => false,
+            "fractional" => true,
+            method => {
+                return Err(PolarsError::ComputeError(
+                    format!("unknown limit_change method `{}`", method).into(),
+                ))
+            }
+        };
+
+        limit_change(x, max_change, fractional, out);
+        Ok(())
+    })
+}
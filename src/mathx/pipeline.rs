@@ -0,0 +1,69 @@
+use polars::prelude::*;
+use serde::Deserialize;
+
+use super::{ewm_mean_from, impl_diff, EwmState};
+use crate::utils::apply_partitioned;
+
+/// One stage of a pipeline, with the parameters of the matching mathx method.
+#[derive(Deserialize, Debug)]
+#[serde(tag = "op", rename_all = "snake_case")]
+pub(crate) enum Stage {
+    Diff {
+        n: i64,
+        method: String,
+    },
+    Shift {
+        n: i64,
+    },
+    EwmMean {
+        alpha: f64,
+        min_periods: u64,
+        adjust: bool,
+    },
+    CumSum,
+}
+
+impl Stage {
+    fn apply(&self, values: &Series) -> PolarsResult<Series> {
+        match self {
+            Stage::Diff { n, method } => impl_diff(values, *n, method),
+            Stage::Shift { n } => Ok(values.shift(*n)),
+            Stage::EwmMean {
+                alpha,
+                min_periods,
+                adjust,
+            } => ewm_mean_from(values, *alpha, *min_periods, *adjust, EwmState::new()),
+            Stage::CumSum => {
+                // like cum_sum, nulls stay null and do not reset the sum
+                let mut sum = 0.0;
+                let result: Float64Chunked = values
+                    .f64()?
+                    .into_iter()
+                    .map(|x| {
+                        x.map(|x| {
+                            sum += x;
+                            sum
+                        })
+                    })
+                    .collect();
+                Ok(result.with_name(values.name()).into_series())
+            }
+        }
+    }
+}
+
+/// Stream each partition of `values` through all `stages` in turn, within a single
+/// call: the intermediate results never leave the partition being processed.
+pub(crate) fn impl_pipeline_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    stages: &[Stage],
+) -> PolarsResult<Series> {
+    apply_partitioned(values, partition_id, |values, _partition, _offset| {
+        let mut result = values.cast(&DataType::Float64)?;
+        for stage in stages {
+            result = stage.apply(&result)?.cast(&DataType::Float64)?;
+        }
+        Ok(result)
+    })
+}
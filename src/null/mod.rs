@@ -0,0 +1,222 @@
+#![allow(clippy::unused_unit)]
+use polars::prelude::*;
+
+use crate::time::duration::Span;
+use crate::utils::apply_partitioned;
+
+fn fill_limit(null_param_1: Option<f64>) -> Option<IdxSize> {
+    null_param_1.map(|n| n as IdxSize)
+}
+
+/// Forward/backward fill where a value is carried for at most `max_staleness`
+/// (measured on `time`) and, optionally, at most `limit` rows.
+/// `time` is expected to be sorted in ascending order.
+fn fill_bounded(
+    values: &Series,
+    time: &Int64Chunked,
+    max_staleness: Span,
+    limit: Option<IdxSize>,
+    forward: bool,
+) -> PolarsResult<Series> {
+    let len = values.len();
+    let is_valid: Vec<bool> = values
+        .is_not_null()
+        .into_iter()
+        .map(|v| v.unwrap_or(false))
+        .collect();
+    let time: Vec<Option<i64>> = time.into_iter().collect();
+
+    let order: Box<dyn Iterator<Item = usize>> = if forward {
+        Box::new(0..len)
+    } else {
+        Box::new((0..len).rev())
+    };
+
+    let mut take_idx: Vec<Option<IdxSize>> = vec![None; len];
+    let mut last_valid: Option<usize> = None;
+    let mut num_filled: IdxSize = 0;
+    for idx in order {
+        if is_valid[idx] {
+            take_idx[idx] = Some(idx as IdxSize);
+            last_valid = Some(idx);
+            num_filled = 0;
+            continue;
+        }
+
+        num_filled += 1;
+        let within_limit = limit.map_or(true, |limit| num_filled <= limit);
+        take_idx[idx] = match (last_valid, time[idx]) {
+            (Some(source), Some(t)) if within_limit => match time[source] {
+                Some(t_source) if forward && max_staleness.covers(t_source, t) => {
+                    Some(source as IdxSize)
+                }
+                Some(t_source) if !forward && max_staleness.covers(t, t_source) => {
+                    Some(source as IdxSize)
+                }
+                _ => None,
+            },
+            _ => None,
+        };
+    }
+
+    values.take(&IdxCa::from_slice_options(values.name(), &take_idx))
+}
+
+/// Fill interior nulls from the surrounding valid values, weighted by their
+/// distance along `x` (ascending), or along the row number when `x` is not given.
+/// Leading and trailing nulls are left untouched.
+fn interpolate_by(
+    values: &Series,
+    x: Option<&Int64Chunked>,
+    nearest: bool,
+) -> PolarsResult<Series> {
+    let len = values.len();
+    let x: Vec<Option<i64>> = match x {
+        Some(x) => x.into_iter().collect(),
+        None => (0..len as i64).map(Some).collect(),
+    };
+    let is_valid: Vec<bool> = values
+        .is_not_null()
+        .into_iter()
+        .map(|v| v.unwrap_or(false))
+        .collect();
+    let is_anchor: Vec<bool> = (0..len)
+        .map(|idx| is_valid[idx] && x[idx].is_some())
+        .collect();
+
+    let mut next_anchor: Vec<Option<usize>> = vec![None; len];
+    let mut next = None;
+    for idx in (0..len).rev() {
+        if is_anchor[idx] {
+            next = Some(idx);
+        }
+        next_anchor[idx] = next;
+    }
+
+    // (previous anchor, next anchor, position of the row between them)
+    let mut bounds: Vec<Option<(usize, usize, f64)>> = vec![None; len];
+    let mut previous = None;
+    for idx in 0..len {
+        if is_anchor[idx] {
+            previous = Some(idx);
+        }
+        if is_valid[idx] {
+            continue;
+        }
+        bounds[idx] = match (previous, next_anchor[idx], x[idx]) {
+            (Some(lo), Some(hi), Some(xi)) => {
+                let (x_lo, x_hi) = (x[lo].unwrap(), x[hi].unwrap());
+                let weight = if x_hi > x_lo {
+                    (xi - x_lo) as f64 / (x_hi - x_lo) as f64
+                } else {
+                    0.0
+                };
+                Some((lo, hi, weight))
+            }
+            _ => None,
+        };
+    }
+
+    if nearest {
+        let take_idx: Vec<Option<IdxSize>> = (0..len)
+            .map(|idx| match bounds[idx] {
+                _ if is_valid[idx] => Some(idx as IdxSize),
+                Some((lo, _, weight)) if weight < 0.5 => Some(lo as IdxSize),
+                Some((_, hi, _)) => Some(hi as IdxSize),
+                None => None,
+            })
+            .collect();
+        return values.take(&IdxCa::from_slice_options(values.name(), &take_idx));
+    }
+
+    if !values.dtype().is_numeric() {
+        return Ok(values.clone());
+    }
+
+    let y = values.cast(&DataType::Float64)?;
+    let y: Vec<Option<f64>> = y.f64()?.into_iter().collect();
+    let result: Vec<Option<f64>> = (0..len)
+        .map(|idx| match bounds[idx] {
+            _ if is_valid[idx] => y[idx],
+            Some((lo, hi, weight)) => match (y[lo], y[hi]) {
+                (Some(y_lo), Some(y_hi)) => Some(y_lo + (y_hi - y_lo) * weight),
+                _ => None,
+            },
+            None => None,
+        })
+        .collect();
+
+    Float64Chunked::from_slice_options(values.name(), &result)
+        .into_series()
+        .cast(values.dtype())
+}
+
+pub(crate) fn impl_handle_null(
+    values: &Series,
+    null_strategy: &str,
+    null_param_1: Option<f64>,
+    time: Option<&Int64Chunked>,
+    max_staleness: Option<Span>,
+    interpolate_by_time: bool,
+) -> PolarsResult<Series> {
+    let x = time.filter(|_| interpolate_by_time);
+    let result = match null_strategy {
+        "sentinel" => match null_param_1 {
+            Some(sentinel) if values.dtype().is_numeric() => values
+                .cast(&DataType::Float64)?
+                .f64()?
+                .fill_null_with_values(sentinel)?
+                .into_series()
+                .cast(values.dtype())?,
+            _ => values.clone(),
+        },
+        "forward" | "backward" if max_staleness.is_some() => {
+            let time = time.ok_or_else(|| {
+                PolarsError::ComputeError("max_staleness requires a time column".into())
+            })?;
+            let forward = null_strategy == "forward";
+            let span = max_staleness.unwrap();
+            fill_bounded(values, time, span, fill_limit(null_param_1), forward)?
+        }
+        "forward" => values.fill_null(FillNullStrategy::Forward(fill_limit(null_param_1)))?,
+        "backward" => values.fill_null(FillNullStrategy::Backward(fill_limit(null_param_1)))?,
+        "interpolate_linear" => interpolate_by(values, x, false)?,
+        "interpolate_nearest" => interpolate_by(values, x, true)?,
+        "min" => values.fill_null(FillNullStrategy::Min)?,
+        "max" => values.fill_null(FillNullStrategy::Max)?,
+        "mean" => values.fill_null(FillNullStrategy::Mean)?,
+        // row-removing strategies are applied by the caller as a filter
+        "ignore" | "trim_start_n" | "trim_end_n" | "drop_if_all" | "drop_if_any" => values.clone(),
+        _ => {
+            return Err(PolarsError::ComputeError(
+                format!("unknown null_strategy `{}`", null_strategy).into(),
+            ))
+        }
+    };
+
+    Ok(result)
+}
+
+pub(crate) fn impl_handle_null_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    null_strategy: &StringChunked,
+    null_param_1: &Float64Chunked,
+    time: Option<&Int64Chunked>,
+    max_staleness: Option<Span>,
+    interpolate_by_time: bool,
+) -> PolarsResult<Series> {
+    apply_partitioned(values, partition_id, |values, _partition, offset| {
+        let strategy = null_strategy.get(offset as usize).unwrap_or("ignore");
+        let param = null_param_1.get(offset as usize);
+        let time = time.map(|time| time.slice(offset, values.len()));
+        impl_handle_null(
+            values,
+            strategy,
+            param,
+            time.as_ref(),
+            max_staleness,
+            interpolate_by_time,
+        )
+    })
+}
@@ -0,0 +1,662 @@
+#![allow(clippy::unused_unit)]
+use polars::prelude::*;
+use polars_time::ClosedWindow;
+use std::collections::VecDeque;
+
+use crate::time::duration::Span;
+use crate::utils::{apply_partitioned_f64, param_at};
+
+/// Statistic computed over each rolling window.
+#[derive(Clone, Copy, PartialEq)]
+pub(crate) enum Statistic {
+    Sum,
+    Mean,
+    Var,
+    Std,
+    Skew,
+    Min,
+    Max,
+    Median,
+    Quantile(f64),
+    Rank,
+}
+
+impl Statistic {
+    pub(crate) fn parse(name: &str, quantile: Option<f64>) -> PolarsResult<Self> {
+        let statistic = match name {
+            "sum" => Statistic::Sum,
+            "mean" => Statistic::Mean,
+            "var" => Statistic::Var,
+            "std" => Statistic::Std,
+            "skew" => Statistic::Skew,
+            "min" => Statistic::Min,
+            "max" => Statistic::Max,
+            "median" => Statistic::Median,
+            "quantile" => match quantile {
+                Some(q) if (0.0..=1.0).contains(&q) => Statistic::Quantile(q),
+                _ => {
+                    return Err(PolarsError::ComputeError(
+                        format!(
+                            "rolling quantile expects a quantile in [0, 1], got {:?}",
+                            quantile
+                        )
+                        .into(),
+                    ))
+                }
+            },
+            "rank" => Statistic::Rank,
+            _ => {
+                return Err(PolarsError::ComputeError(
+                    format!("unknown rolling statistic `{}`", name).into(),
+                ))
+            }
+        };
+
+        Ok(statistic)
+    }
+}
+
+/// Running state of a window: rows enter at the end and leave from the start.
+trait Accumulator {
+    fn push(&mut self, idx: usize, x: f64);
+    fn pop(&mut self, idx: usize, x: f64);
+    fn count(&self) -> usize;
+    fn value(&self, current: Option<f64>) -> Option<f64>;
+}
+
+/// Sum and central moments, updated with Welford's recurrences (and their inverse).
+struct Moments {
+    statistic: Statistic,
+    n: usize,
+    sum: f64,
+    mean: f64,
+    m2: f64,
+    m3: f64,
+}
+
+impl Moments {
+    fn new(statistic: Statistic) -> Self {
+        Moments {
+            statistic,
+            n: 0,
+            sum: 0.0,
+            mean: 0.0,
+            m2: 0.0,
+            m3: 0.0,
+        }
+    }
+}
+
+impl Accumulator for Moments {
+    fn push(&mut self, _idx: usize, x: f64) {
+        let n1 = self.n as f64;
+        self.n += 1;
+        let n = self.n as f64;
+        let delta = x - self.mean;
+        let delta_n = delta / n;
+        let term1 = delta * delta_n * n1;
+        self.sum += x;
+        self.mean += delta_n;
+        self.m3 += term1 * delta_n * (n - 2.0) - 3.0 * delta_n * self.m2;
+        self.m2 += term1;
+    }
+
+    fn pop(&mut self, _idx: usize, x: f64) {
+        if self.n <= 1 {
+            *self = Moments::new(self.statistic);
+            return;
+        }
+
+        let n = self.n as f64;
+        let n1 = n - 1.0;
+        self.n -= 1;
+        self.sum -= x;
+        self.mean = (n * self.mean - x) / n1;
+        let delta = x - self.mean;
+        let delta_n = delta / n;
+        let term1 = delta * delta_n * n1;
+        self.m2 -= term1;
+        self.m3 -= term1 * delta_n * (n - 2.0) - 3.0 * delta_n * self.m2;
+    }
+
+    fn count(&self) -> usize {
+        self.n
+    }
+
+    fn value(&self, _current: Option<f64>) -> Option<f64> {
+        let n = self.n as f64;
+        match self.statistic {
+            Statistic::Sum => Some(self.sum),
+            Statistic::Mean => Some(self.mean),
+            Statistic::Var if self.n > 1 => Some(self.m2.max(0.0) / (n - 1.0)),
+            Statistic::Std if self.n > 1 => Some((self.m2.max(0.0) / (n - 1.0)).sqrt()),
+            Statistic::Skew if self.m2 > 0.0 => Some(n.sqrt() * self.m3 / self.m2.powf(1.5)),
+            _ => None,
+        }
+    }
+}
+
+/// Minimum or maximum, kept at the front of a monotonic deque.
+struct Extremum {
+    is_max: bool,
+    n: usize,
+    deque: VecDeque<(usize, f64)>,
+}
+
+impl Extremum {
+    fn new(is_max: bool) -> Self {
+        Extremum {
+            is_max,
+            n: 0,
+            deque: VecDeque::new(),
+        }
+    }
+
+    fn dominates(&self, a: f64, b: f64) -> bool {
+        if self.is_max {
+            a >= b
+        } else {
+            a <= b
+        }
+    }
+}
+
+impl Accumulator for Extremum {
+    fn push(&mut self, idx: usize, x: f64) {
+        while let Some(&(_, back)) = self.deque.back() {
+            if !self.dominates(x, back) {
+                break;
+            }
+            self.deque.pop_back();
+        }
+        self.deque.push_back((idx, x));
+        self.n += 1;
+    }
+
+    fn pop(&mut self, idx: usize, _x: f64) {
+        while let Some(&(front_idx, _)) = self.deque.front() {
+            if front_idx > idx {
+                break;
+            }
+            self.deque.pop_front();
+        }
+        self.n -= 1;
+    }
+
+    fn count(&self) -> usize {
+        self.n
+    }
+
+    fn value(&self, _current: Option<f64>) -> Option<f64> {
+        self.deque.front().map(|&(_, x)| x)
+    }
+}
+
+/// Median, quantile and percentile rank of the window, kept as a multiset over
+/// the distinct values of the partition: a Fenwick tree of counts per value gives
+/// O(log n) insert, delete, k-th smallest and rank queries.
+struct OrderStatistics {
+    statistic: Statistic,
+    keys: Vec<f64>,
+    tree: Vec<usize>,
+    n: usize,
+}
+
+impl OrderStatistics {
+    fn new(statistic: Statistic, values: &[Option<f64>]) -> Self {
+        let mut keys: Vec<f64> = values.iter().flatten().copied().collect();
+        keys.sort_unstable_by(|a, b| a.total_cmp(b));
+        keys.dedup_by(|a, b| a.total_cmp(b).is_eq());
+
+        OrderStatistics {
+            statistic,
+            tree: vec![0; keys.len() + 1],
+            keys,
+            n: 0,
+        }
+    }
+
+    /// position of `x` among the distinct values
+    fn position(&self, x: f64) -> usize {
+        self.keys.partition_point(|v| v.total_cmp(&x).is_lt())
+    }
+
+    fn add(&mut self, x: f64, insert: bool) {
+        let mut i = self.position(x) + 1;
+        while i < self.tree.len() {
+            if insert {
+                self.tree[i] += 1;
+            } else {
+                self.tree[i] -= 1;
+            }
+            i += i & i.wrapping_neg();
+        }
+    }
+
+    /// number of values in the window below the `position`-th distinct value
+    fn count_below(&self, position: usize) -> usize {
+        let mut count = 0;
+        let mut i = position;
+        while i > 0 {
+            count += self.tree[i];
+            i -= i & i.wrapping_neg();
+        }
+        count
+    }
+
+    /// k-th smallest value in the window (0-based)
+    fn kth(&self, k: usize) -> f64 {
+        let mut position = 0;
+        let mut remaining = k;
+        let mut step = (self.tree.len() - 1).next_power_of_two();
+        while step > 0 {
+            let next = position + step;
+            if next < self.tree.len() && self.tree[next] <= remaining {
+                position = next;
+                remaining -= self.tree[next];
+            }
+            step >>= 1;
+        }
+        self.keys[position]
+    }
+}
+
+/// Linear interpolation between the closest ranks of a sorted window.
+pub(crate) fn quantile_of(n: usize, q: f64, kth: impl Fn(usize) -> f64) -> Option<f64> {
+    if n == 0 {
+        return None;
+    }
+    let position = q * (n - 1) as f64;
+    let lo = position.floor() as usize;
+    let hi = position.ceil() as usize;
+    let (x_lo, x_hi) = (kth(lo), kth(hi));
+    Some(x_lo + (x_hi - x_lo) * (position - lo as f64))
+}
+
+/// Average (1-based) rank of `x` among `n` values, `less` of them below and
+/// `equal` of them equal to `x`, scaled into (0, 1].
+pub(crate) fn percentile_rank(n: usize, less: usize, equal: usize) -> Option<f64> {
+    if n == 0 {
+        return None;
+    }
+    let rank = less as f64 + (equal as f64 + 1.0) / 2.0;
+    Some(rank / n as f64)
+}
+
+impl Accumulator for OrderStatistics {
+    fn push(&mut self, _idx: usize, x: f64) {
+        self.add(x, true);
+        self.n += 1;
+    }
+
+    fn pop(&mut self, _idx: usize, x: f64) {
+        self.add(x, false);
+        self.n -= 1;
+    }
+
+    fn count(&self) -> usize {
+        self.n
+    }
+
+    fn value(&self, current: Option<f64>) -> Option<f64> {
+        match self.statistic {
+            Statistic::Median => quantile_of(self.n, 0.5, |k| self.kth(k)),
+            Statistic::Quantile(q) => quantile_of(self.n, q, |k| self.kth(k)),
+            Statistic::Rank => {
+                let position = self.position(current?);
+                let less = self.count_below(position);
+                let equal = self.count_below(position + 1) - less;
+                percentile_rank(self.n, less, equal)
+            }
+            _ => None,
+        }
+    }
+}
+
+fn new_accumulator(statistic: Statistic, values: &[Option<f64>]) -> Box<dyn Accumulator> {
+    match statistic {
+        Statistic::Sum | Statistic::Mean | Statistic::Var | Statistic::Std | Statistic::Skew => {
+            Box::new(Moments::new(statistic))
+        }
+        Statistic::Min => Box::new(Extremum::new(false)),
+        Statistic::Max => Box::new(Extremum::new(true)),
+        Statistic::Median | Statistic::Quantile(_) | Statistic::Rank => {
+            Box::new(OrderStatistics::new(statistic, values))
+        }
+    }
+}
+
+/// Evaluate `statistic` over the window `[start, end)` of each row, given as
+/// bounds that never move backwards, into `out`. Nulls are skipped, and a window
+/// holding fewer than `min_periods` values yields null.
+fn rolling_sweep(
+    values: &[Option<f64>],
+    bounds: impl Iterator<Item = (usize, usize)>,
+    statistic: Statistic,
+    min_periods: usize,
+    out: &mut [Option<f64>],
+) {
+    let mut acc = new_accumulator(statistic, values);
+    let (mut lo, mut hi) = (0, 0);
+
+    for ((idx, (start, end)), out) in bounds.enumerate().zip(out.iter_mut()) {
+        while hi < end {
+            if let Some(x) = values[hi] {
+                acc.push(hi, x);
+            }
+            hi += 1;
+        }
+        while lo < start {
+            if let Some(x) = values[lo] {
+                acc.pop(lo, x);
+            }
+            lo += 1;
+        }
+
+        *out = if acc.count() >= min_periods.max(1) {
+            acc.value(values[idx])
+        } else {
+            None
+        };
+    }
+}
+
+fn count_window_bounds(len: usize, window: usize) -> Vec<(usize, usize)> {
+    (0..len)
+        .map(|idx| ((idx + 1).saturating_sub(window), idx + 1))
+        .collect()
+}
+
+pub(crate) fn parse_closed(closed: &str) -> PolarsResult<ClosedWindow> {
+    match closed {
+        "left" => Ok(ClosedWindow::Left),
+        "right" => Ok(ClosedWindow::Right),
+        "both" => Ok(ClosedWindow::Both),
+        "none" => Ok(ClosedWindow::None),
+        _ => Err(PolarsError::ComputeError(
+            format!("unknown closed interval `{}`", closed).into(),
+        )),
+    }
+}
+
+/// Window `[start, end)` of each row: the rows whose time lies within `span`
+/// before the time of the row, the ends of the interval included as per `closed`.
+/// Both ends are found with a two-pointer sweep over `time` (ascending).
+pub(crate) fn time_window_bounds(
+    time: &[i64],
+    span: Span,
+    closed: ClosedWindow,
+) -> Vec<(usize, usize)> {
+    let include_start = matches!(closed, ClosedWindow::Left | ClosedWindow::Both);
+    let include_end = matches!(closed, ClosedWindow::Right | ClosedWindow::Both);
+    let (mut start, mut end) = (0, 0);
+
+    time.iter()
+        .map(|&t| {
+            while end < time.len() && (time[end] < t || (include_end && time[end] == t)) {
+                end += 1;
+            }
+            while start < end {
+                let distance = span.distance(time[start], t);
+                let outside =
+                    distance > span.length() || (!include_start && distance == span.length());
+                if !outside {
+                    break;
+                }
+                start += 1;
+            }
+            (start, end)
+        })
+        .collect()
+}
+
+fn time_partition(time: &Int64Chunked, offset: i64, len: usize) -> PolarsResult<Vec<i64>> {
+    time.slice(offset, len)
+        .into_iter()
+        .map(|t| {
+            t.ok_or_else(|| {
+                PolarsError::ComputeError("rolling over time requires a non-null time".into())
+            })
+        })
+        .collect()
+}
+
+/// Window `[start, end)` of each of the `len` rows of the `partition`-th partition,
+/// spanning `window` rows or, when the partition has a `period`, a duration of
+/// `time`; and the number of values a window needs to yield a result.
+#[allow(clippy::too_many_arguments)]
+fn partition_windows(
+    len: usize,
+    partition: usize,
+    offset: i64,
+    window: &[Option<i64>],
+    min_periods: &[Option<i64>],
+    period: &[Option<&str>],
+    time: Option<&Int64Chunked>,
+    closed: ClosedWindow,
+) -> PolarsResult<(Vec<(usize, usize)>, usize)> {
+    let min_periods = param_at(min_periods, "min_periods", partition).ok();
+
+    // like polars, a count window needs to be full by default,
+    // while a period needs a single value
+    match param_at(period, "period", partition) {
+        Ok(period) => {
+            let time = time.ok_or_else(|| {
+                PolarsError::ComputeError("rolling over a period requires a time column".into())
+            })?;
+            let time = time_partition(time, offset, len)?;
+            let bounds = time_window_bounds(&time, Span::parse(period)?, closed);
+            Ok((bounds, min_periods.map_or(1, |n| n.max(0) as usize)))
+        }
+        Err(_) => {
+            let window = param_at(window, "window", partition)?;
+            if window <= 0 {
+                return Err(PolarsError::ComputeError(
+                    format!("rolling window must be positive, got {}", window).into(),
+                ));
+            }
+            let bounds = count_window_bounds(len, window as usize);
+            Ok((
+                bounds,
+                min_periods.map_or(window as usize, |n| n.max(0) as usize),
+            ))
+        }
+    }
+}
+
+fn to_f64_vec(values: &Series) -> PolarsResult<Vec<Option<f64>>> {
+    let values = values.cast(&DataType::Float64)?;
+    let values = values.f64()?.into_iter().collect();
+    Ok(values)
+}
+
+/// Rolling `statistic` of each partition, over a window of `window` rows or,
+/// when the partition has a `period`, over a duration of `time`.
+#[allow(clippy::too_many_arguments)]
+pub(crate) fn impl_rolling_partitioned(
+    values: &Series,
+    partition_id: &Series,
+    window: &Int64Chunked,
+    min_periods: &Int64Chunked,
+    quantile: &Float64Chunked,
+    period: &StringChunked,
+    time: Option<&Int64Chunked>,
+    statistic: &str,
+    closed: ClosedWindow,
+) -> PolarsResult<Series> {
+    let window: Vec<Option<i64>> = window.into_iter().collect();
+    let min_periods: Vec<Option<i64>> = min_periods.into_iter().collect();
+    let quantile: Vec<Option<f64>> = quantile.into_iter().collect();
+    let period: Vec<Option<&str>> = period.into_iter().collect();
+
+    apply_partitioned_f64(values, partition_id, |x, partition, offset, out| {
+        let statistic =
+            Statistic::parse(statistic, param_at(&quantile, "quantile", partition).ok())?;
+        let (bounds, min_periods) = partition_windows(
+            x.len(),
+            partition,
+            offset,
+            &window,
+            &min_periods,
+            &period,
+            time,
+            closed,
+        )?;
+
+        rolling_sweep(x, bounds.into_iter(), statistic, min_periods, out);
+        Ok(())
+    })
+}
+
+/// Statistic computed over each rolling window of a pair of series.
+#[derive(Clone, Copy, PartialEq)]
+pub(crate) enum PairStatistic {
+    Corr,
+    Cov,
+    Beta,
+}
+
+impl PairStatistic {
+    pub(crate) fn parse(name: &str) -> PolarsResult<Self> {
+        match name {
+            "corr" => Ok(PairStatistic::Corr),
+            "cov" => Ok(PairStatistic::Cov),
+            "beta" => Ok(PairStatistic::Beta),
+            _ => Err(PolarsError::ComputeError(
+                format!("unknown rolling pairwise statistic `{}`", name).into(),
+            )),
+        }
+    }
+}
+
+/// Means, second moments and co-moment of a pair of series, updated with
+/// Welford's recurrences (and their inverse).
+#[derive(Default)]
+struct CoMoments {
+    n: usize,
+    mean_x: f64,
+    mean_y: f64,
+    m2_x: f64,
+    m2_y: f64,
+    c: f64,
+}
+
+impl CoMoments {
+    fn push(&mut self, x: f64, y: f64) {
+        self.n += 1;
+        let n = self.n as f64;
+        let delta_x = x - self.mean_x;
+        let delta_y = y - self.mean_y;
+        self.mean_x += delta_x / n;
+        self.mean_y += delta_y / n;
+        self.m2_x += delta_x * (x - self.mean_x);
+        self.m2_y += delta_y * (y - self.mean_y);
+        self.c += delta_x * (y - self.mean_y);
+    }
+
+    fn pop(&mut self, x: f64, y: f64) {
+        if self.n <= 1 {
+            *self = CoMoments::default();
+            return;
+        }
+
+        let n = self.n as f64;
+        self.n -= 1;
+        let n1 = self.n as f64;
+        let (mean_x, mean_y) = (self.mean_x, self.mean_y);
+        self.mean_x = (n * mean_x - x) / n1;
+        self.mean_y = (n * mean_y - y) / n1;
+        let delta_x = x - self.mean_x;
+        self.m2_x -= delta_x * (x - mean_x);
+        self.m2_y -= (y - self.mean_y) * (y - mean_y);
+        self.c -= delta_x * (y - mean_y);
+    }
+
+    fn value(&self, statistic: PairStatistic) -> Option<f64> {
+        let (m2_x, m2_y) = (self.m2_x.max(0.0), self.m2_y.max(0.0));
+        match statistic {
+            PairStatistic::Cov if self.n > 1 => Some(self.c / (self.n - 1) as f64),
+            PairStatistic::Corr if m2_x > 0.0 && m2_y > 0.0 => {
+                Some((self.c / (m2_x * m2_y).sqrt()).clamp(-1.0, 1.0))
+            }
+            PairStatistic::Beta if m2_y > 0.0 => Some(self.c / m2_y),
+            _ => None,
+        }
+    }
+}
+
+/// Evaluate `statistic` of `x` against `y` over the window `[start, end)` of each
+/// row, into `out`. Rows where either value is null are skipped, and a window holding fewer
+/// than `min_periods` pairs yields null.
+fn pairwise_sweep(
+    x: &[Option<f64>],
+    y: &[Option<f64>],
+    bounds: impl Iterator<Item = (usize, usize)>,
+    statistic: PairStatistic,
+    min_periods: usize,
+    out: &mut [Option<f64>],
+) {
+    let mut acc = CoMoments::default();
+    let (mut lo, mut hi) = (0, 0);
+
+    for ((start, end), out) in bounds.zip(out.iter_mut()) {
+        while hi < end {
+            if let (Some(x), Some(y)) = (x[hi], y[hi]) {
+                acc.push(x, y);
+            }
+            hi += 1;
+        }
+        while lo < start {
+            if let (Some(x), Some(y)) = (x[lo], y[lo]) {
+                acc.pop(x, y);
+            }
+            lo += 1;
+        }
+
+        *out = if acc.n >= min_periods.max(1) {
+            acc.value(statistic)
+        } else {
+            None
+        };
+    }
+}
+
+/// Rolling `statistic` of `values` against `other`, aligned row by row, over the
+/// windows of each partition (see `impl_rolling_partitioned`).
+#[allow(clippy::too_many_arguments)]
+pub(crate) fn impl_rolling_pairwise_partitioned(
+    values: &Series,
+    other: &Series,
+    partition_id: &Series,
+    window: &Int64Chunked,
+    min_periods: &Int64Chunked,
+    period: &StringChunked,
+    time: Option<&Int64Chunked>,
+    statistic: &str,
+    closed: ClosedWindow,
+) -> PolarsResult<Series> {
+    let statistic = PairStatistic::parse(statistic)?;
+    let window: Vec<Option<i64>> = window.into_iter().collect();
+    let min_periods: Vec<Option<i64>> = min_periods.into_iter().collect();
+    let period: Vec<Option<&str>> = period.into_iter().collect();
+
+    // the other series is cast once, then read partition by partition
+    let other = to_f64_vec(other)?;
+
+    apply_partitioned_f64(values, partition_id, |x, partition, offset, out| {
+        let (bounds, min_periods) = partition_windows(
+            x.len(),
+            partition,
+            offset,
+            &window,
+            &min_periods,
+            &period,
+            time,
+            closed,
+        )?;
+
+        let y = &other[offset as usize..offset as usize + x.len()];
+        pairwise_sweep(x, y, bounds.into_iter(), statistic, min_periods, out);
+        Ok(())
+    })
+}
@@ -0,0 +1,116 @@
+use polars::prelude::*;
+use polars_time::Duration;
+
+pub(crate) const NANOSECONDS_IN_DAY: i64 = 86_400_000_000_000;
+
+/// Convert a temporal (or integer) series into nanosecond ticks.
+pub(crate) fn time_to_ns(time: &Series) -> PolarsResult<Int64Chunked> {
+    let factor = match time.dtype() {
+        DataType::Date => NANOSECONDS_IN_DAY,
+        DataType::Datetime(TimeUnit::Milliseconds, _) => 1_000_000,
+        DataType::Datetime(TimeUnit::Microseconds, _) => 1_000,
+        _ => 1,
+    };
+
+    let ticks = time.to_physical_repr().cast(&DataType::Int64)?;
+    let ticks = ticks.i64()?;
+    Ok(ticks * factor)
+}
+
+/// Number of weekdays (mon-fri) in the interval (from_day, to_day],
+/// both given as days since the unix epoch.
+pub(crate) fn business_days_between(from_day: i64, to_day: i64) -> i64 {
+    // 1970-01-01 was a thursday, so day -3 is a monday
+    let weekdays_upto = |day: i64| {
+        let since_monday = day + 3;
+        since_monday.div_euclid(7) * 5 + (since_monday.rem_euclid(7) + 1).min(5)
+    };
+
+    weekdays_upto(to_day) - weekdays_upto(from_day)
+}
+
+/// Check that `span` is a positive, fixed-length polars duration string, i.e. one
+/// or more `<integer><unit>` parts such as `1h30m`. Calendar units (`mo`, `q`, `y`)
+/// and index counts (`i`) have no fixed length in nanoseconds, and a negative span
+/// gives an inverted window, so they are rejected rather than passed on to
+/// `Duration::parse`, which panics on anything it cannot read.
+fn validate_duration(span: &str) -> PolarsResult<()> {
+    const UNITS: [&str; 9] = ["ns", "us", "µs", "ms", "s", "m", "h", "d", "w"];
+
+    let invalid = || {
+        PolarsError::ComputeError(
+            format!(
+                "invalid duration `{}`: expected a positive duration in units of {}",
+                span,
+                UNITS.join(", ")
+            )
+            .into(),
+        )
+    };
+
+    let mut rest = span;
+    if rest.is_empty() {
+        return Err(invalid());
+    }
+
+    while !rest.is_empty() {
+        let digits = rest.len() - rest.trim_start_matches(|c: char| c.is_ascii_digit()).len();
+        let unit_len = rest[digits..]
+            .find(|c: char| c.is_ascii_digit())
+            .unwrap_or(rest.len() - digits);
+        let unit = &rest[digits..digits + unit_len];
+        if digits == 0 || !UNITS.contains(&unit) {
+            return Err(invalid());
+        }
+        rest = &rest[digits + unit_len..];
+    }
+
+    Ok(())
+}
+
+/// A length of time, either fixed (`90s`, `3d`, ...) or counted in business days (`3bd`).
+#[derive(Clone, Copy, Debug)]
+pub(crate) enum Span {
+    Fixed(i64),
+    BusinessDays(i64),
+}
+
+impl Span {
+    pub(crate) fn parse(span: &str) -> PolarsResult<Span> {
+        match span.strip_suffix("bd") {
+            Some(n) => match n.parse::<u32>() {
+                Ok(n) => Ok(Span::BusinessDays(n as i64)),
+                Err(_) => Err(PolarsError::ComputeError(
+                    format!("invalid business-day span `{}`", span).into(),
+                )),
+            },
+            None => {
+                validate_duration(span)?;
+                Ok(Span::Fixed(Duration::parse(span).duration_ns()))
+            }
+        }
+    }
+
+    /// length of the span, in the unit returned by `distance`
+    pub(crate) fn length(&self) -> i64 {
+        match self {
+            Span::Fixed(ns) => *ns,
+            Span::BusinessDays(n) => *n,
+        }
+    }
+
+    /// distance between two nanosecond timestamps
+    pub(crate) fn distance(&self, from: i64, to: i64) -> i64 {
+        match self {
+            Span::Fixed(_) => to - from,
+            Span::BusinessDays(_) => business_days_between(
+                from.div_euclid(NANOSECONDS_IN_DAY),
+                to.div_euclid(NANOSECONDS_IN_DAY),
+            ),
+        }
+    }
+
+    pub(crate) fn covers(&self, from: i64, to: i64) -> bool {
+        self.distance(from, to) <= self.length()
+    }
+}
@@ -1,6 +1,7 @@
 // #![allow(clippy::unused_unit)]
 // use polars::prelude::*;
 
+pub(crate) mod duration;
 pub(crate) mod utils;
 
 // const CAPACITY_FACTOR: usize = 5;
@@ -1,10 +1,105 @@
 use polars::prelude::*;
+use polars_core::utils::try_get_supertype;
 
 pub(crate) fn same_output_type(input_fields: &[Field]) -> PolarsResult<Field> {
     let field = &input_fields[0];
     Ok(field.clone())
 }
 
+/// Split a partition-id column into (offset, len) runs of equal ids.
+/// The input is expected to hold each partition contiguously.
+pub(crate) fn partition_slices(partition_id: &Series) -> PolarsResult<Vec<(i64, usize)>> {
+    let ids = partition_id.cast(&DataType::UInt64)?;
+    let ids = ids.u64()?;
+
+    let mut result: Vec<(i64, usize)> = Vec::new();
+    let mut previous: Option<Option<u64>> = None;
+    for (idx, id) in ids.into_iter().enumerate() {
+        if previous != Some(id) {
+            result.push((idx as i64, 0));
+            previous = Some(id);
+        }
+        if let Some((_, len)) = result.last_mut() {
+            *len += 1;
+        }
+    }
+
+    Ok(result)
+}
+
+/// Apply `f` to each contiguous partition of `values`, together with the position
+/// of the partition (in order of appearance) and its offset into `values`,
+/// and concatenate the results.
+/// Results of differing dtypes are cast to their common supertype.
+/// Kernels with a Float64 result use `apply_partitioned_f64` instead.
+pub(crate) fn apply_partitioned<F>(
+    values: &Series,
+    partition_id: &Series,
+    mut f: F,
+) -> PolarsResult<Series>
+where
+    F: FnMut(&Series, usize, i64) -> PolarsResult<Series>,
+{
+    let mut results: Vec<Series> = Vec::new();
+    for (partition, (offset, len)) in partition_slices(partition_id)?.into_iter().enumerate() {
+        results.push(f(&values.slice(offset, len), partition, offset)?);
+    }
+
+    let mut dtype = match results.first() {
+        Some(first) => first.dtype().clone(),
+        None => return Ok(values.clear()),
+    };
+    for partition_result in results.iter().skip(1) {
+        dtype = try_get_supertype(&dtype, partition_result.dtype())?;
+    }
+
+    let mut result = Series::new_empty(values.name(), &dtype);
+    for partition_result in results {
+        result.append(&partition_result.cast(&dtype)?)?;
+    }
+
+    Ok(result.rechunk())
+}
+
+/// Apply the Float64 kernel `f` to each contiguous partition of `values`, cast to
+/// Float64 once. `f` writes the result of a partition straight into its range of
+/// a single output buffer sized to the frame, located by the partition's offset,
+/// so no Series is allocated per partition.
+pub(crate) fn apply_partitioned_f64<F>(
+    values: &Series,
+    partition_id: &Series,
+    mut f: F,
+) -> PolarsResult<Series>
+where
+    F: FnMut(&[Option<f64>], usize, i64, &mut [Option<f64>]) -> PolarsResult<()>,
+{
+    let x = values.cast(&DataType::Float64)?;
+    let x: Vec<Option<f64>> = x.f64()?.into_iter().collect();
+    let mut result: Vec<Option<f64>> = vec![None; x.len()];
+
+    for (partition, (offset, len)) in partition_slices(partition_id)?.into_iter().enumerate() {
+        let range = offset as usize..offset as usize + len;
+        f(&x[range.clone()], partition, offset, &mut result[range])?;
+    }
+
+    Ok(Float64Chunked::from_slice_options(values.name(), &result).into_series())
+}
+
+/// Parameter of the `partition`-th partition: `params` holds either one entry
+/// per partition, or a single entry shared by all partitions.
+pub(crate) fn param_at<T: Copy>(
+    params: &[Option<T>],
+    name: &str,
+    partition: usize,
+) -> PolarsResult<T> {
+    let idx = if params.len() == 1 { 0 } else { partition };
+    params.get(idx).copied().flatten().ok_or_else(|| {
+        PolarsError::ComputeError(
+            format!("missing parameter `{}` for partition {}", name, partition).into(),
+        )
+    })
+}
+
 // This function is useful for writing functions which
 // accept pairs of List columns. Delete if unneded.
 #[allow(dead_code)]
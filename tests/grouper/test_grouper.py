@@ -78,3 +78,25 @@ def test_default(df):
         ValueError, match="Bad Grouper invocation. Undefined specification"
     ):
         Grouper().apply(df)
+
+
+def test_schema_resolved_once_per_frame(df, monkeypatch):
+    Grouper.clear_cache()
+    resolved = []
+    schema = pl.LazyFrame.schema
+
+    def counting_schema(self):
+        resolved.append(self)
+        return schema.fget(self)
+
+    monkeypatch.setattr(pl.LazyFrame, "schema", property(counting_schema))
+
+    assert Grouper.categories(df, include_time=False) == ["catsa", "catsb"]
+    assert Grouper.values(df, exclude=[]) == ["flt1", "flt2", "text"]
+    assert Grouper.numerics(df, exclude=["flt2"]) == ["flt1"]
+    assert Grouper.by_all().apply(df) == ["catsa", "catsb"]
+    assert len(resolved) == 1
+
+    # a new plan on top of the frame has a schema of its own
+    assert Grouper.categories(df.drop("catsa"), include_time=False) == ["catsb"]
+    assert len(resolved) == 2
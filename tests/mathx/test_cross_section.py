@@ -0,0 +1,68 @@
+import datetime
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+import polars_ts as ts  # noqa
+
+
+@pytest.fixture
+def df() -> pl.LazyFrame:
+    t = datetime.date(2024, 1, 1)
+    assets = ["A", "B", "C", "D", "E", "F"]
+    ndays = 4
+
+    result = pl.LazyFrame(
+        [
+            pl.Series(
+                "time",
+                [t + datetime.timedelta(days=d) for d in range(ndays)] * len(assets),
+            ),
+            pl.Series("asset", sorted(assets * ndays), dtype=pl.Categorical),
+            pl.Series("sector", sorted(["X", "Y"] * 12), dtype=pl.Categorical),
+            pl.Series("value", [float((i * 7) % 11) for i in range(0, 24)]),
+        ]
+    )
+
+    return result
+
+
+@pytest.mark.parametrize(
+    "op, kwargs, expected_expr",
+    [
+        ("cs_rank", {}, pl.col("value").rank() / pl.col("value").count()),
+        (
+            "cs_zscore",
+            {},
+            (pl.col("value") - pl.col("value").mean()) / pl.col("value").std(),
+        ),
+        ("cs_demean", {}, pl.col("value") - pl.col("value").mean()),
+        (
+            "cs_winsorize",
+            {"lower": 0.2, "upper": 0.8},
+            pl.col("value").clip(
+                pl.col("value").quantile(0.2, "linear"),
+                pl.col("value").quantile(0.8, "linear"),
+            ),
+        ),
+    ],
+)
+def test_cross_section(df, op, kwargs, expected_expr):
+    result = getattr(df.mathx, op)(**kwargs).collect()
+
+    expected = df.with_columns(expected_expr.over("time")).collect()
+
+    assert_frame_equal(result, expected)
+
+
+def test_neutralize(df):
+    result = df.mathx.neutralize(ts.Grouper.by("sector")).collect()
+
+    expected = df.with_columns(
+        (pl.col("value") - pl.col("value").mean()).over("time", "sector")
+    ).collect()
+
+    assert_frame_equal(result, expected)
+
+    per_sector = result.group_by("time", "sector").agg(pl.col("value").sum())
+    assert per_sector["value"].abs().max() < 1e-9
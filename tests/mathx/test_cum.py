@@ -0,0 +1,94 @@
+import datetime
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+import polars_ts  # noqa
+
+
+@pytest.fixture
+def df() -> pl.LazyFrame:
+    t = datetime.date(2024, 1, 1)
+
+    result = pl.LazyFrame(
+        [
+            pl.Series("time", [t + datetime.timedelta(days=d) for d in range(5)] * 2),
+            pl.Series("asset", ["A"] * 5 + ["B"] * 5, dtype=pl.Categorical),
+            pl.Series("value", [2.0, 3.0, 1.5, None, 4.0] + [1.0, 0.5, 0.25, 2.0, 1.0]),
+        ]
+    )
+
+    return result
+
+
+@pytest.mark.parametrize("op", ["prod", "min", "max"])
+def test_cum_ops(df, op):
+    result = getattr(df.mathx, f"cum_{op}")().collect()
+
+    expected = df.with_columns(
+        getattr(pl.col("value"), f"cum_{op}")().over("asset")
+    ).collect()
+
+    assert_frame_equal(result, expected)
+
+
+def test_drawdown(df):
+    result = df.mathx.drawdown().collect()
+
+    expected = df.with_columns(
+        pl.Series("value_peak", [2.0, 3.0, 3.0, None, 4.0, 1.0, 1.0, 1.0, 2.0, 2.0]),
+        pl.Series(
+            "value_drawdown",
+            [0.0, 0.0, -0.5, None, 0.0, 0.0, -0.5, -0.75, 0.0, -0.5],
+        ),
+        pl.Series("value_duration", [0, 0, 1, None, 0, 0, 1, 2, 0, 1], dtype=pl.UInt32),
+    ).collect()
+
+    assert_frame_equal(result, expected)
+
+    arithmetic = df.mathx.drawdown(method="arithmetic").collect()
+    assert arithmetic["value_drawdown"].to_list()[:5] == [0.0, 0.0, -1.5, None, 0.0]
+
+
+@pytest.mark.parametrize("op", ["sum", "prod", "min", "max"])
+def test_cum_ops_reset_on(df, op):
+    session = pl.Series("session", ["x", "x", "y", "y", "x"] * 2)
+    df = df.with_columns(session)
+
+    by_flag = getattr(df.mathx, f"cum_{op}")(reset_on=pl.col("value") < 1.0)
+    by_change = getattr(df.mathx, f"cum_{op}")(reset_on="session")
+
+    def segmented(segment: pl.Expr) -> pl.LazyFrame:
+        return df.with_columns(
+            getattr(pl.col("value"), f"cum_{op}")().over("asset", segment.cum_sum())
+        )
+
+    flag = (pl.col("value") < 1.0).fill_null(False)
+    change = pl.col("session") != pl.col("session").shift().over("asset")
+
+    assert_frame_equal(by_flag.collect(), segmented(flag.over("asset")).collect())
+    assert_frame_equal(by_change.collect(), segmented(change.fill_null(True)).collect())
+
+
+def test_cum_reset_on_keeps_input_order():
+    df = pl.LazyFrame(
+        [
+            pl.Series("asset", ["A", "B", "A", "B", "A", "B"], dtype=pl.Categorical),
+            pl.Series("value", [1.0, 10.0, 2.0, 20.0, 3.0, 30.0]),
+            pl.Series("roll", [False, False, True, False, False, False]),
+        ]
+    )
+
+    result = df.mathx.cum_sum(reset_on="roll").collect()
+
+    assert result["asset"].to_list() == ["A", "B", "A", "B", "A", "B"]
+    assert result["value"].to_list() == [1.0, 10.0, 2.0, 30.0, 5.0, 60.0]
+
+
+def test_fractional_drawdown_needs_a_positive_peak():
+    df = pl.LazyFrame({"value": [-2.0, -3.0, 0.0, -1.0, 2.0, 1.0]})
+
+    result = df.mathx.drawdown().collect()
+
+    assert result["value_peak"].to_list() == [-2.0, -2.0, 0.0, 0.0, 2.0, 2.0]
+    assert result["value_drawdown"].to_list() == [None, None, None, None, 0.0, -0.5]
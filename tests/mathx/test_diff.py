@@ -343,7 +343,12 @@ def test_multi_param_no_categories():
     )
 
     with pytest.raises(ValueError, match="multiple params without any categories"):
-        (df.mathx.diff(params=params.drop("a")).collect())
+        df.mathx.diff(params=params.drop("a").collect())
+
+    # a lazy params plan is only checked once the query runs
+    result = df.mathx.diff(params=params.drop("a"))
+    with pytest.raises(pl.ComputeError, match="multiple params without any categories"):
+        result.collect()
 
     result_df = df.mathx.diff(params=params).collect()
 
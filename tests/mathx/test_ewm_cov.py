@@ -0,0 +1,62 @@
+import datetime
+import polars as pl
+from polars.testing import assert_frame_equal, assert_series_equal
+import pytest
+
+import polars_ts  # noqa
+
+
+@pytest.fixture
+def df() -> pl.LazyFrame:
+    t = datetime.date(2024, 1, 1)
+    nrows = 10
+    x = [float((i * 7) % 11) for i in range(0, nrows)]
+
+    result = pl.LazyFrame(
+        [
+            pl.Series(
+                "time",
+                [t + datetime.timedelta(days=days) for days in range(0, nrows)] * 2,
+            ),
+            pl.Series("asset", ["A"] * nrows + ["B"] * nrows, dtype=pl.Categorical),
+            pl.Series("value", x + [2.0 * v + 1.0 for v in x]),
+        ]
+    )
+
+    return result
+
+
+@pytest.mark.parametrize("adjust", [False, True])
+def test_ewm_cov_diagonal_is_ewm_var(df, adjust):
+    result = (
+        df.mathx.ewm_cov(alpha=0.3, adjust=adjust)
+        .filter(pl.col("asset") == pl.col("asset_other"))
+        .drop("asset_other")
+        .sort("asset", "time")
+        .collect()
+    )
+
+    expected = df.with_columns(
+        pl.col("value")
+        .ewm_var(alpha=0.3, adjust=adjust, bias=False, ignore_nulls=True)
+        .over("asset")
+    ).collect()
+
+    assert_frame_equal(result, expected)
+
+
+def test_ewm_cov_and_corr_of_linear_series(df):
+    cov = df.mathx.ewm_cov(alpha=0.3).collect()
+    corr = df.mathx.ewm_corr(alpha=0.3, min_periods=2).collect()
+
+    # full matrix of 2 series at each of 10 times
+    assert cov.height == 40
+    assert cov.columns == ["time", "asset", "asset_other", "value"]
+
+    # B = 2A + 1
+    def pair(frame, lhs, rhs):
+        return frame.filter(asset=lhs, asset_other=rhs)["value"]
+
+    assert_series_equal(pair(cov, "A", "B"), 2.0 * pair(cov, "A", "A"))
+    assert_series_equal(pair(cov, "B", "A"), pair(cov, "A", "B"))
+    assert_series_equal(pair(corr, "A", "B"), pl.Series("value", [None] + [1.0] * 9))
@@ -993,3 +993,63 @@ def test_basic(df, params):
     ).select(result.columns)
 
     assert_frame_equal(result, expected_result)
+
+
+@pytest.mark.parametrize("adjust", [False, True])
+def test_resume_from_state(df, adjust):
+    full = df.mathx.ewm_mean(alpha=0.2, min_periods=3, adjust=adjust).collect()
+
+    history = df.filter(pl.col("time") < datetime.date(2024, 1, 20))
+    new_rows = df.filter(pl.col("time") >= datetime.date(2024, 1, 20))
+
+    state = history.mathx.ewm_mean_state(alpha=0.2, adjust=adjust).collect()
+    # B has no history yet, and starts afresh
+    assert state["item"].to_list() == ["A"]
+
+    resumed = new_rows.mathx.ewm_mean(
+        alpha=0.2, min_periods=3, adjust=adjust, state=state
+    ).collect()
+
+    expected = full.filter(pl.col("time") >= datetime.date(2024, 1, 20))
+    assert_frame_equal(resumed, expected, check_exact=True)
+
+
+@pytest.mark.parametrize("adjust", [False, True])
+def test_ewm_bank(df, adjust):
+    alphas = [0.1, 0.5, 0.9]
+    result = df.mathx.ewm_bank(alphas=alphas, adjust=adjust).collect()
+
+    expected = df.select(
+        "time",
+        "item",
+        *[
+            pl.col(c)
+            .ewm_mean(alpha=alpha, adjust=adjust, ignore_nulls=True)
+            .over("item")
+            .alias(f"{c}_ewm_{alpha}")
+            for c in ["val1", "val2"]
+            for alpha in alphas
+        ],
+    ).collect()
+
+    assert_frame_equal(result, expected)
+
+
+def test_ewm_half_life_on_irregular_time():
+    t = datetime.datetime(2024, 1, 1)
+    hours = [0, 1, 3, 4, 10, 11, 60]
+    df = pl.LazyFrame(
+        [
+            pl.Series("time", [t + datetime.timedelta(hours=h) for h in hours] * 2),
+            pl.Series("item", ["A"] * 7 + ["B"] * 7, dtype=pl.Categorical),
+            pl.Series("value", [float((i * 7) % 11) for i in range(0, 14)]),
+        ]
+    )
+
+    result = df.mathx.ewm_mean(half_life="2h").collect()
+
+    expected = df.with_columns(
+        pl.col("value").ewm_mean_by("time", half_life="2h").over("item")
+    ).collect()
+
+    assert_frame_equal(result, expected)
@@ -0,0 +1,53 @@
+import datetime
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+import polars_ts  # noqa
+
+
+@pytest.fixture
+def df() -> pl.LazyFrame:
+    t = datetime.date(2024, 1, 1)
+    nrows = 10
+
+    result = pl.LazyFrame(
+        [
+            pl.Series(
+                "time",
+                [t + datetime.timedelta(days=days) for days in range(0, nrows)] * 2,
+            ),
+            pl.Series("asset", ["A"] * nrows + ["B"] * nrows, dtype=pl.Categorical),
+            pl.Series(
+                "value",
+                [float((i * 7) % 11) for i in range(0, nrows)]
+                + [float((i * 5) % 13) - 6.0 for i in range(0, nrows)],
+            ),
+        ]
+    )
+
+    return result
+
+
+def test_pipeline_matches_chained_methods(df):
+    result = df.mathx.pipeline(
+        ["diff", ("ewm_mean", {"alpha": 0.3}), ("shift", {"n": 2}), "cum_sum"]
+    ).collect()
+
+    expected = (
+        df.mathx.diff()
+        .mathx.ewm_mean(alpha=0.3)
+        .mathx.shift(n=2)
+        .mathx.cum_sum()
+        .collect()
+    )
+
+    assert_frame_equal(result, expected)
+
+
+def test_pipeline_rejects_unknown_steps(df):
+    with pytest.raises(ValueError):
+        df.mathx.pipeline(["diff", "rank"])
+
+    with pytest.raises(ValueError):
+        df.mathx.pipeline([("shift", {"periods": 1})])
@@ -0,0 +1,91 @@
+import datetime
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+import polars_ts  # noqa
+
+
+@pytest.fixture
+def df() -> pl.LazyFrame:
+    t = datetime.date(2024, 1, 1)
+
+    result = pl.LazyFrame(
+        [
+            pl.Series("time", [t + datetime.timedelta(days=d) for d in range(6)] * 2),
+            pl.Series("asset", ["A"] * 6 + ["B"] * 6, dtype=pl.Categorical),
+            pl.Series(
+                "regime",
+                ["up", "up", "down", "down", "down", "up"] + ["down"] * 6,
+                dtype=pl.Categorical,
+            ),
+            pl.Series("value", [1.0, 1.5, 3.0, 2.0, 2.5, -1.0] + [10.0, 10.0, 9.0] * 2),
+        ]
+    )
+
+    return result
+
+
+def test_rle_categorical(df):
+    result = df.mathx.rle("regime").collect()
+
+    t = datetime.date(2024, 1, 1)
+    expected = pl.DataFrame(
+        [
+            pl.Series("asset", ["A", "A", "A", "B"], dtype=pl.Categorical),
+            pl.Series("run_id", [0, 1, 2, 0], dtype=pl.UInt32),
+            pl.Series("time", [t + datetime.timedelta(days=d) for d in [0, 2, 5, 0]]),
+            pl.Series("run_length", [2, 3, 1, 6], dtype=pl.UInt32),
+            pl.Series("regime", ["up", "down", "up", "down"], dtype=pl.Categorical),
+        ]
+    )
+
+    assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_rle_numeric(df):
+    result = df.mathx.rle("value", partition=polars_ts.Grouper.by("asset")).collect()
+
+    assert result.filter(asset="B")["run_length"].to_list() == [2, 1, 2, 1]
+
+
+@pytest.mark.parametrize(
+    "method, max_change, expected_values",
+    [
+        ("arithmetic", 1.0, [1.0, 1.5, 2.5, 2.0, 2.5, 1.5]),
+        ("fractional", 0.5, [1.0, 1.5, 2.25, 2.0, 2.5, 1.25]),
+    ],
+)
+def test_limit_change(df, method, max_change, expected_values):
+    result = (
+        df.drop("regime")
+        .mathx.limit_change(max_change=max_change, method=method)
+        .filter(asset="A")
+        .collect()
+    )
+
+    assert result["value"].to_list() == expected_values
+
+
+def test_rle_without_time_or_partition():
+    df = pl.LazyFrame({"value": [1.0, 1.0, 2.0, 1.0]})
+
+    result = df.mathx.rle("value").collect()
+
+    assert result["run_length"].to_list() == [2, 1, 1]
+    assert result["value"].to_list() == [1.0, 2.0, 1.0]
+
+
+def test_rle_reserved_columns(df):
+    with pytest.raises(ValueError, match="reserved"):
+        df.with_columns(run_id=pl.lit(0)).mathx.rle("regime")
+
+
+def test_rle_of_the_only_category():
+    df = pl.LazyFrame({"regime": ["up", "up", "down"]}).with_columns(
+        pl.col("regime").cast(pl.Categorical)
+    )
+
+    result = df.mathx.rle("regime", partition=polars_ts.Grouper.by("regime"))
+
+    assert result.collect()["run_length"].to_list() == [2, 1]
@@ -0,0 +1,181 @@
+import datetime
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+import polars_ts as ts  # noqa
+
+
+@pytest.fixture
+def df() -> pl.LazyFrame:
+    t = datetime.date(2024, 1, 1)
+    nrows = 20
+
+    result = pl.LazyFrame(
+        [
+            pl.Series(
+                "time",
+                [t + datetime.timedelta(days=days) for days in range(0, nrows)] * 2,
+            ),
+            pl.Series("asset", ["A"] * nrows + ["B"] * nrows, dtype=pl.Categorical),
+            pl.Series(
+                "value",
+                [float((i * 7) % 11) for i in range(0, nrows)]
+                + [float((i * 5) % 13) - 6.0 for i in range(0, nrows)],
+            ),
+        ]
+    )
+
+    return result
+
+
+@pytest.mark.parametrize(
+    "statistic, expected_expr",
+    [
+        ("sum", pl.col("value").rolling_sum(5, min_periods=2)),
+        ("mean", pl.col("value").rolling_mean(5, min_periods=2)),
+        ("var", pl.col("value").rolling_var(5, min_periods=2)),
+        ("std", pl.col("value").rolling_std(5, min_periods=2)),
+        ("min", pl.col("value").rolling_min(5, min_periods=2)),
+        ("max", pl.col("value").rolling_max(5, min_periods=2)),
+        ("median", pl.col("value").rolling_median(5, min_periods=2)),
+    ],
+)
+def test_rolling_matches_polars(df, statistic, expected_expr):
+    result = getattr(df.mathx, f"rolling_{statistic}")(
+        window=5, min_periods=2
+    ).collect()
+
+    expected = df.with_columns(expected_expr.over("asset")).collect()
+
+    assert_frame_equal(result, expected)
+
+
+def test_rolling_quantile_and_rank(df):
+    quantile = df.mathx.rolling_quantile(window=4, quantile=0.25).collect()
+    expected = df.with_columns(
+        pl.col("value")
+        .rolling_quantile(0.25, interpolation="linear", window_size=4)
+        .over("asset")
+    ).collect()
+    assert_frame_equal(quantile, expected)
+
+    rank = (
+        pl.LazyFrame({"value": [3.0, 1.0, 2.0, 2.0, 5.0]})
+        .mathx.rolling_rank(window=3, min_periods=1)
+        .collect()
+    )
+    assert rank["value"].to_list() == [1.0, 0.5, 2.0 / 3.0, 2.5 / 3.0, 1.0]
+
+
+def test_rolling_window_per_partition(df):
+    params = pl.LazyFrame(
+        [
+            pl.Series("asset", ["A", "B"], dtype=pl.Categorical),
+            pl.Series("window", [2, 6]),
+        ]
+    )
+
+    result = df.mathx.rolling_mean(params=params).collect()
+
+    expected = pl.concat(
+        [
+            df.filter(asset="A").with_columns(pl.col("value").rolling_mean(2)),
+            df.filter(asset="B").with_columns(pl.col("value").rolling_mean(6)),
+        ]
+    ).collect()
+
+    assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize("closed", ["left", "right", "both", "none"])
+def test_rolling_over_period(closed):
+    t = datetime.datetime(2024, 1, 1)
+    minutes = [0, 1, 1, 4, 5, 9, 10, 11, 20, 21]
+    df = pl.LazyFrame(
+        [
+            pl.Series("time", [t + datetime.timedelta(minutes=m) for m in minutes] * 2),
+            pl.Series("asset", ["A"] * 10 + ["B"] * 10, dtype=pl.Categorical),
+            pl.Series("value", [float(i) for i in range(0, 20)]),
+        ]
+    )
+
+    result = df.mathx.rolling_mean(window="5m", closed=closed).collect()
+
+    expected = df.with_columns(
+        pl.col("value")
+        .rolling_mean_by("time", "5m", closed=closed, warn_if_unsorted=False)
+        .over("asset")
+    ).collect()
+
+    assert_frame_equal(result, expected)
+
+
+def test_rolling_over_business_days():
+    times = [datetime.date(2024, 1, d) for d in [5, 8, 9, 10]]
+    df = pl.LazyFrame(
+        [
+            pl.Series("time", times, dtype=pl.Date),
+            pl.Series("value", [1.0, 2.0, 3.0, 4.0]),
+        ]
+    )
+
+    result = df.mathx.rolling_sum(window="2bd").collect()
+
+    assert result["value"].to_list() == [1.0, 3.0, 5.0, 7.0]
+
+
+def test_rolling_pairwise(df):
+    market = pl.LazyFrame(
+        [
+            pl.Series("time", df.collect()["time"][:20]),
+            pl.Series("asset", ["M"] * 20, dtype=pl.Categorical),
+            pl.Series("value", [float((i * 3) % 7) for i in range(0, 20)]),
+        ]
+    )
+    panel = pl.concat([df, market])
+    is_market = pl.col("asset") == "M"
+
+    pairs = df.join(
+        market.select("time", asset_other="asset", value_other="value"), on="time"
+    )
+    cov = pl.rolling_cov("value", "value_other", window_size=5)
+    var = pl.col("value_other").rolling_var(5)
+    expected = {
+        "corr": pl.rolling_corr("value", "value_other", window_size=5),
+        "cov": cov,
+        "beta": cov / var,
+    }
+
+    for statistic, expected_expr in expected.items():
+        result = getattr(panel.mathx, f"rolling_{statistic}")(
+            is_market, window=5
+        ).collect()
+
+        expected_df = (
+            pairs.with_columns(expected_expr.over("asset").alias("value"))
+            .select("time", "asset", "value", "asset_other")
+            .collect()
+        )
+
+        assert_frame_equal(result, expected_df, check_exact=False)
+
+
+@pytest.mark.parametrize("window", ["3x", "d", "1h2"])
+def test_rolling_over_invalid_period(df, window):
+    with pytest.raises(pl.ComputeError, match="invalid duration"):
+        df.mathx.rolling_mean(window=window).collect()
+
+    with pytest.raises(pl.ComputeError, match="invalid duration"):
+        df.mathx.ewm_mean(half_life=window).collect()
+
+
+@pytest.mark.parametrize("window", ["1mo", "1q", "1y", "5i", "-5m", "1mo_saturating"])
+def test_rolling_rejects_calendar_and_negative_periods(df, window):
+    with pytest.raises(pl.ComputeError, match="invalid duration"):
+        df.mathx.rolling_mean(window=window).collect()
+
+
+def test_rolling_rejects_negative_business_days(df):
+    with pytest.raises(pl.ComputeError, match="invalid business-day span"):
+        df.mathx.rolling_mean(window="-2bd").collect()
@@ -213,3 +213,18 @@ def test_basic(df, params):
     )
 
     assert_frame_equal(result, expected_result)
+
+
+def test_keeps_input_order():
+    df = pl.LazyFrame(
+        [
+            pl.Series("item", ["A", "B", "A", "B", "A", "B"], dtype=pl.Categorical),
+            pl.Series("value", [1.0, 10.0, 2.0, 20.0, 3.0, 30.0]),
+        ]
+    )
+
+    result = df.mathx.shift().collect()
+
+    expected = df.with_columns(pl.col("value").shift().over("item")).collect()
+
+    assert_frame_equal(result, expected)
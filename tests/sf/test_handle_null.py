@@ -0,0 +1,173 @@
+import datetime
+import polars as pl
+from polars.testing import assert_frame_equal
+import pytest
+
+import polars_ts  # noqa
+
+
+@pytest.fixture
+def df() -> pl.LazyFrame:
+    result = pl.LazyFrame(
+        [
+            pl.Series("item", ["A", "B", "A", "B", "A", "B", "A", "B"]),
+            pl.Series("value", [1.0, None, None, 2.0, None, None, 4.0, None]),
+        ]
+    ).with_columns(pl.col("item").cast(pl.Categorical))
+
+    return result
+
+
+def test_forward_with_limit(df):
+    result = df.sf.handle_null(null_strategy="forward", null_param_1=1).collect()
+
+    expected = pl.DataFrame(
+        [
+            pl.Series("item", ["A", "A", "A", "A", "B", "B", "B", "B"]),
+            pl.Series("value", [1.0, 1.0, None, 4.0, None, 2.0, 2.0, None]),
+        ]
+    ).with_columns(pl.col("item").cast(pl.Categorical))
+
+    assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_trim_start_n(df):
+    result = df.sf.handle_null(null_strategy="trim_start_n", null_param_1=1).collect()
+
+    expected = pl.DataFrame(
+        [
+            pl.Series("item", ["A", "A", "A", "B", "B", "B"]),
+            pl.Series("value", [None, None, 4.0, 2.0, None, None]),
+        ]
+    ).with_columns(pl.col("item").cast(pl.Categorical))
+
+    assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_strategy_per_partition(df):
+    params = pl.LazyFrame(
+        [
+            pl.Series("item", ["A", "B"], dtype=pl.Categorical),
+            pl.Series("null_strategy", ["forward", "sentinel"], dtype=pl.Categorical),
+            pl.Series("null_param_1", [1.0, -1.0]),
+        ]
+    )
+
+    result = df.sf.handle_null(params=params).collect()
+
+    expected = pl.DataFrame(
+        [
+            pl.Series("item", ["A", "A", "A", "A", "B", "B", "B", "B"]),
+            pl.Series("value", [1.0, 1.0, None, 4.0, -1.0, 2.0, -1.0, -1.0]),
+        ]
+    ).with_columns(pl.col("item").cast(pl.Categorical))
+
+    assert_frame_equal(result, expected, check_dtype=False)
+
+
+def test_mixed_strategies_in_one_pass():
+    df = pl.LazyFrame(
+        [
+            pl.Series("asset_class", ["fx"] * 4 + ["rates"] * 4 + ["equity"] * 4),
+            pl.Series(
+                "value",
+                [1.0, None, None, 4.0] * 3,
+            ),
+        ]
+    ).with_columns(pl.col("asset_class").cast(pl.Categorical))
+
+    params = pl.LazyFrame(
+        [
+            pl.Series("asset_class", ["fx", "rates", "equity"], dtype=pl.Categorical),
+            pl.Series(
+                "null_strategy",
+                ["forward", "sentinel", "interpolate_linear"],
+                dtype=pl.Categorical,
+            ),
+            pl.Series("null_param_1", [None, 0.0, None], dtype=pl.Float64),
+        ]
+    )
+
+    result = df.sf.handle_null(params=params).collect()
+
+    expected = pl.DataFrame(
+        [
+            pl.Series("asset_class", ["fx"] * 4 + ["rates"] * 4 + ["equity"] * 4),
+            pl.Series(
+                "value",
+                [1.0, 1.0, 1.0, 4.0] + [1.0, 0.0, 0.0, 4.0] + [1.0, 2.0, 3.0, 4.0],
+            ),
+        ]
+    ).with_columns(pl.col("asset_class").cast(pl.Categorical))
+
+    assert_frame_equal(result, expected, check_dtype=False)
+
+
+@pytest.mark.parametrize(
+    "max_staleness, expected_values",
+    [
+        ("2d", [1.0, 1.0, 1.0, None, 5.0]),
+        ("1bd", [1.0, 1.0, 1.0, None, 5.0]),
+        ("4d", [1.0, 1.0, 1.0, 1.0, 5.0]),
+    ],
+)
+def test_forward_with_max_staleness(max_staleness, expected_values):
+    times = [
+        datetime.date(2024, 1, 5),
+        datetime.date(2024, 1, 6),
+        datetime.date(2024, 1, 7),
+        datetime.date(2024, 1, 9),
+        datetime.date(2024, 1, 10),
+    ]
+    df = pl.LazyFrame(
+        [
+            pl.Series("time", times, dtype=pl.Date),
+            pl.Series("value", [1.0, None, None, None, 5.0]),
+        ]
+    )
+
+    result = df.sf.handle_null(
+        null_strategy="forward", max_staleness=max_staleness
+    ).collect()
+
+    expected = pl.DataFrame(
+        [
+            pl.Series("time", times, dtype=pl.Date),
+            pl.Series("value", expected_values),
+        ]
+    )
+
+    assert_frame_equal(result, expected)
+
+
+@pytest.mark.parametrize(
+    "null_strategy, interpolate_by, expected_values",
+    [
+        ("interpolate_linear", "row", [0.0, 10.0 / 3.0, 20.0 / 3.0, 10.0]),
+        ("interpolate_linear", "time", [0.0, 1.0, 4.0, 10.0]),
+        ("interpolate_nearest", "row", [0.0, 0.0, 10.0, 10.0]),
+        ("interpolate_nearest", "time", [0.0, 0.0, 0.0, 10.0]),
+    ],
+)
+def test_interpolate_by(null_strategy, interpolate_by, expected_values):
+    t = datetime.date(2024, 1, 1)
+    times = [t + datetime.timedelta(days=days) for days in [0, 1, 4, 10]]
+    df = pl.LazyFrame(
+        [
+            pl.Series("time", times, dtype=pl.Date),
+            pl.Series("value", [0.0, None, None, 10.0]),
+        ]
+    )
+
+    result = df.sf.handle_null(
+        null_strategy=null_strategy, interpolate_by=interpolate_by
+    ).collect()
+
+    expected = pl.DataFrame(
+        [
+            pl.Series("time", times, dtype=pl.Date),
+            pl.Series("value", expected_values),
+        ]
+    )
+
+    assert_frame_equal(result, expected)
@@ -1,5 +1,6 @@
 from datetime import datetime, timedelta
 import polars as pl
+from polars.testing import assert_frame_equal
 from polars_ts.grouper import Grouper
 import pytest
 
@@ -43,3 +44,139 @@ def test_join(df):
     assert self_join.select(sorted(self_join.columns)).equals(
         expected_self_join.select(sorted(expected_self_join.columns))
     )
+
+
+@pytest.mark.parametrize(
+    "asof_strategy, tolerance, expected_quotes",
+    [
+        ("backward", None, [None, 10.0, 11.0, 20.0]),
+        ("backward", "1d", [None, None, 11.0, 20.0]),
+        ("forward", None, [10.0, 11.0, 12.0, None]),
+        ("nearest", None, [10.0, 11.0, 11.0, 20.0]),
+    ],
+)
+def test_join_asof(asof_strategy, tolerance, expected_quotes):
+    lhs = pl.LazyFrame(
+        {
+            "time": [
+                datetime(2024, 1, 1),
+                datetime(2024, 1, 4),
+                datetime(2024, 1, 6),
+                datetime(2024, 1, 3),
+            ],
+            "asset": ["A", "A", "A", "B"],
+            "trade": [1.0, 2.0, 3.0, 4.0],
+        },
+        schema={"time": pl.Datetime, "asset": pl.Categorical, "trade": pl.Float64},
+    )
+
+    rhs = pl.LazyFrame(
+        {
+            "time": [
+                datetime(2024, 1, 2),
+                datetime(2024, 1, 5),
+                datetime(2024, 1, 8),
+                datetime(2024, 1, 2),
+            ],
+            "asset": ["A", "A", "A", "B"],
+            "quote": [10.0, 11.0, 12.0, 20.0],
+        },
+        schema={"time": pl.Datetime, "asset": pl.Categorical, "quote": pl.Float64},
+    )
+
+    result = (
+        lhs.sf.join(rhs, how="asof", asof_strategy=asof_strategy, tolerance=tolerance)
+        .sort("asset", "time")
+        .collect()
+    )
+
+    assert result["quote"].to_list() == expected_quotes
+
+
+@pytest.mark.parametrize(
+    "closed, expected_pairs",
+    [
+        ("both", [(1, "r1"), (2, "r1"), (2, "r2"), (3, "r2"), (5, "r3"), (6, "r3")]),
+        ("left", [(1, "r1"), (2, "r2"), (5, "r3"), (6, "r3")]),
+        ("right", [(2, "r1"), (3, "r2"), (6, "r3")]),
+        ("none", [(6, "r3")]),
+    ],
+)
+def test_join_interval(closed, expected_pairs):
+    lhs = pl.LazyFrame(
+        {
+            "time": [datetime(2024, 1, d) for d in [1, 2, 3, 4, 2, 3]],
+            "asset": ["A", "A", "A", "A", "B", "B"],
+            "row": [1, 2, 3, 4, 5, 6],
+        },
+        schema={"time": pl.Datetime, "asset": pl.Categorical, "row": pl.Int64},
+    )
+
+    rhs = pl.LazyFrame(
+        {
+            "asset": ["A", "A", "B"],
+            "start": [datetime(2024, 1, d) for d in [1, 2, 2]],
+            "end": [datetime(2024, 1, d) for d in [2, 3, 4]],
+            "interval": ["r1", "r2", "r3"],
+        },
+        schema={
+            "asset": pl.Categorical,
+            "start": pl.Datetime,
+            "end": pl.Datetime,
+            "interval": pl.String,
+        },
+    )
+
+    result = (
+        lhs.sf.join_interval(rhs, closed=closed)
+        .select("row", "interval")
+        .sort("row", "interval")
+        .collect()
+    )
+
+    assert list(result.iter_rows()) == expected_pairs
+
+
+@pytest.mark.parametrize("how", ["inner", "left", "outer_coalesce", "semi", "anti"])
+def test_join_many(how):
+    base = pl.DataFrame(
+        {"time": [1, 2, 3, 4], "asset": ["A", "B", "A", "B"], "v0": [0, 1, 2, 3]},
+        schema_overrides={"asset": pl.Categorical},
+    )
+    others = [
+        pl.DataFrame(
+            {
+                "time": [1, 2, 3, 5],
+                "asset": ["A", "B", "A", "A"],
+                "v1": [10, 11, 12, 13],
+            },
+            schema_overrides={"asset": pl.Categorical},
+        ).lazy(),
+        pl.DataFrame(
+            {"time": [2, 3], "asset": ["B", "A"], "v2": [21, 22]},
+            schema_overrides={"asset": pl.Categorical},
+        ),
+    ]
+
+    result = base.lazy().sf.join_many(others, how=how).collect()
+
+    expected = base
+    for other in others:
+        expected = expected.join(other.lazy().collect(), on=["time", "asset"], how=how)
+
+    assert_frame_equal(result, expected, check_row_order=False)
+
+
+def test_join_many_on_time():
+    frames = [
+        pl.LazyFrame({"time": [1, 2, 3], f"v{n}": [n, n + 1, n + 2]})
+        for n in range(0, 4)
+    ]
+
+    result = frames[0].sf.join_many(frames[1:]).collect()
+
+    assert result.columns == ["time", "v0", "v1", "v2", "v3"]
+    assert result["v3"].to_list() == [3, 4, 5]
+
+    with pytest.raises(ValueError):
+        frames[0].sf.join_many([])
@@ -2,6 +2,8 @@ from datetime import datetime, timedelta
 import polars as pl
 import pytest
 
+from polars_ts.sf_helper import partition_id_name, with_partition_id
+
 
 @pytest.fixture
 def df() -> pl.LazyFrame:
@@ -38,3 +40,22 @@ def test_unique(df):
     expected_default_unique = df.collect()
 
     assert default_unique.equals(expected_default_unique)
+
+
+def test_partition_id_is_first_row_and_reused():
+    df = pl.LazyFrame(
+        {"asset": ["X", "Y", "X", "Z", "Y"], "value": [1, 2, 3, 4, 5]},
+        schema={"asset": pl.Categorical, "value": pl.Int64},
+    )
+    partition_id = partition_id_name(["asset"])
+
+    result = df.pipe(with_partition_id, ["asset"])
+    assert result.collect()[partition_id].to_list() == [0, 1, 0, 3, 1]
+    assert result.schema[partition_id] == pl.UInt32
+
+    # the id already carried by the frame is not computed again
+    assert result.pipe(with_partition_id, ["asset"]) is result
+
+    cum_sum = df.mathx.cum_sum().collect()
+    assert cum_sum.columns == ["asset", "value"]
+    assert cum_sum["value"].to_list() == [1, 2, 4, 4, 7]
@@ -0,0 +1,51 @@
+def bench_me(nrows: int = 1_000_000, nitems: int = 10, window: int = 2000):
+    import time
+
+    import numpy as np
+    import polars as pl
+    import polars_ts  # noqa
+
+    rng = np.random.default_rng(0)
+    df = pl.DataFrame(
+        [
+            pl.Series("item", np.repeat(np.arange(nitems), nrows // nitems)).cast(
+                pl.String
+            ),
+            pl.Series("value", rng.standard_normal(nrows)),
+        ]
+    ).with_columns(pl.col("item").cast(pl.Categorical))
+    lf = df.lazy()
+
+    def timed(label, fn):
+        start = time.perf_counter()
+        result = fn()
+        print(f"{label:<32} {time.perf_counter() - start:8.3f}s")
+        return result
+
+    for quantile in [0.1, 0.5, 0.9]:
+        print(f"quantile={quantile}, window={window}, rows={nrows}, items={nitems}")
+
+        ours = timed(
+            "mathx.rolling_quantile",
+            lambda: lf.mathx.rolling_quantile(
+                window=window, quantile=quantile
+            ).collect(),
+        )
+        theirs = timed(
+            "polars rolling_quantile.over",
+            lambda: lf.select(
+                "item",
+                pl.col("value")
+                .rolling_quantile(quantile, interpolation="linear", window_size=window)
+                .over("item"),
+            ).collect(),
+        )
+
+        # both sides see each partition in its original row order
+        np.testing.assert_allclose(
+            ours["value"].to_numpy(), theirs["value"].to_numpy(), equal_nan=True
+        )
+
+
+if __name__ == "__main__":
+    bench_me()